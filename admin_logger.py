@@ -1,5 +1,7 @@
+import asyncio
 import logging
-from datetime import datetime
+import time
+from functools import lru_cache
 from typing import Optional
 
 from aiogram import Bot
@@ -11,6 +13,191 @@ from markdown_utils import escape_markdown_v2
 
 logger = logging.getLogger(__name__)
 
+# Memoized escaper: admin names and action strings repeat constantly, and
+# wrapping escape_markdown_v2 directly in lru_cache avoids an extra Python
+# frame on cache misses.
+_esc = lru_cache(maxsize=4096)(escape_markdown_v2)
+
+# Batching configuration: at most _BATCH_MAX_ENTRIES entries (or _BATCH_MAX_BYTES
+# of UTF-8) are concatenated into a single send_message call. Sizing the batch
+# by the encoded byte length (not len() of the str, which undercounts emoji and
+# Cyrillic) keeps us safely under Telegram's message cap and avoids a 400
+# Bad Request round-trip on oversized batches.
+_BATCH_MAX_ENTRIES = 10
+_BATCH_MAX_BYTES = 4000
+_BATCH_SEPARATOR = "\n\n\\-\\-\\-\n\n"
+_SEPARATOR_BYTES = len(_BATCH_SEPARATOR.encode("utf-8"))
+
+# Static MarkdownV2 scaffolding, hoisted so the hot path only concatenates
+# known-constant objects with the variable substrings
+_HEADER = "🔧 *Admin Action Log*\n\n"
+_TIME = "⏰ *Time:* "
+_ADMIN = "\n👤 *Admin:* "
+_ACTION = "\n⚡️ *Action:* "
+_TARGET = "\n🎯 *Target User:* `"
+_DETAILS = "\n📝 *Details:* "
+
+# Log group id is resolved from admin_config once on first use and memoized,
+# so the hot path pays a local load instead of a config attribute lookup.
+_log_group_id: Optional[int] = None
+_log_group_resolved = False
+
+
+def _get_log_group_id() -> Optional[int]:
+    """Resolve and memoize admin_config.log_group_id."""
+    global _log_group_id, _log_group_resolved
+    if not _log_group_resolved:
+        _log_group_id = admin_config.log_group_id
+        _log_group_resolved = True
+    return _log_group_id
+
+
+def refresh_log_group_id() -> None:
+    """Drop the memoized log group id (e.g. after admin_config changes in tests)."""
+    global _log_group_resolved
+    _log_group_resolved = False
+
+# Shared queue of pre-formatted log blocks, drained by a single consumer task.
+# Bounded so a runaway caller cannot exhaust memory; on overflow the oldest
+# entry is dropped and counted, and the drop count is reported once per flush.
+_QUEUE_MAXSIZE = 1000
+_log_queue: asyncio.Queue = asyncio.Queue(maxsize=_QUEUE_MAXSIZE)
+_dropped = 0
+_writer_task: Optional[asyncio.Task] = None
+_writer_lock = asyncio.Lock()
+
+# Keep strong references to fire-and-forget tasks so they aren't GC'd mid-flight.
+_pending: set = set()
+
+
+async def _ensure_writer(bot: Bot) -> None:
+    """Lazily start the single log-writer task on first use."""
+    global _writer_task
+    if _writer_task is not None and not _writer_task.done():
+        return
+    async with _writer_lock:
+        if _writer_task is None or _writer_task.done():
+            _writer_task = asyncio.create_task(_log_writer(bot))
+
+
+async def _log_writer(bot: Bot) -> None:
+    """
+    Consumer loop: take the first pending entry, opportunistically drain more
+    pending entries up to the batch limits, and post them as one message.
+
+    Single-writer invariant: _ensure_writer guarantees at most one instance of
+    this task, so only one send_message to the log chat is ever in flight —
+    bursts serialize here instead of tripping Telegram's per-chat flood limits.
+    """
+    backoff = 1.0
+    while True:
+        batch = [await _log_queue.get()]
+        total_bytes = len(batch[0].encode("utf-8"))
+        while len(batch) < _BATCH_MAX_ENTRIES:
+            try:
+                entry = _log_queue.get_nowait()
+            except asyncio.QueueEmpty:
+                break
+            entry_bytes = len(entry.encode("utf-8"))
+            if total_bytes + _SEPARATOR_BYTES + entry_bytes > _BATCH_MAX_BYTES:
+                # Put it back for the next batch rather than overflow Telegram's limit
+                _log_queue.put_nowait(entry)
+                break
+            batch.append(entry)
+            total_bytes += _SEPARATOR_BYTES + entry_bytes
+
+        message = _BATCH_SEPARATOR.join(batch)
+        global _dropped
+        if _dropped:
+            message += f"\n\n⚠️ {_dropped} log entries dropped under load"
+            _dropped = 0
+
+        try:
+            await bot.send_message(
+                chat_id=_get_log_group_id(),
+                text=message,
+                parse_mode=ParseMode.MARKDOWN_V2
+            )
+            backoff = 1.0
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("Flushed %d admin action log(s) to group", len(batch))
+        except TelegramAPIError as e:
+            logger.error("Failed to send admin action log batch: %s", e)
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, 60.0)
+        except Exception as e:
+            logger.error("Unexpected error in admin log writer: %s", e)
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, 60.0)
+
+
+def _format_log_entry(
+    admin_id: int,
+    admin_name: str,
+    action: str,
+    details: Optional[str],
+    target_user_id: Optional[int],
+) -> str:
+    """
+    Pure string pipeline for one log entry: timestamp + escape + concatenate.
+    Kept as a single fully-annotated function so it can be compiled with mypyc
+    should profiling ever justify a native build.
+    """
+    # Format timestamp directly from localtime integers with the dots
+    # pre-escaped, so it needs no strftime interpreter and never touches the
+    # escape cache (it changes every second and would only pollute it)
+    lt = time.localtime()
+    timestamp = (
+        f"{lt.tm_mday:02d}\\.{lt.tm_mon:02d}\\.{lt.tm_year} "
+        f"{lt.tm_hour:02d}:{lt.tm_min:02d}:{lt.tm_sec:02d}"
+    )
+
+    # Build log message by concatenating hoisted scaffolding constants
+    target_line = f"{_TARGET}{target_user_id}`" if target_user_id else ""
+    details_line = f"{_DETAILS}{_esc(details)}" if details else ""
+    return (
+        f"{_HEADER}{_TIME}{timestamp}"
+        f"{_ADMIN}{_esc(admin_name)} \\(`{admin_id}`\\)"
+        f"{_ACTION}{_esc(action)}{target_line}{details_line}"
+    )
+
+
+def _enqueue(bot: Bot, log_message: str) -> None:
+    """Queue one formatted entry and make sure the writer task is running."""
+    global _dropped
+    try:
+        _log_queue.put_nowait(log_message)
+    except asyncio.QueueFull:
+        _dropped += 1
+        try:
+            _log_queue.get_nowait()
+            _log_queue.put_nowait(log_message)
+        except (asyncio.QueueEmpty, asyncio.QueueFull):
+            pass
+    if _writer_task is None or _writer_task.done():
+        task = asyncio.create_task(_ensure_writer(bot))
+        _pending.add(task)
+        task.add_done_callback(_pending.discard)
+
+
+async def log_admin_action_fast(bot: Bot, admin_id: int, admin_name: str, action: str) -> None:
+    """
+    Specialized fast path for the common call shape (no details, no target):
+    one timestamp, two escapes, a single f-string, straight into the queue.
+    """
+    if not _get_log_group_id():
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Admin action logged (no log group): %s by %s (%s)", action, admin_name, admin_id)
+        return
+
+    lt = time.localtime()
+    _enqueue(bot, (
+        f"{_HEADER}{_TIME}{lt.tm_mday:02d}\\.{lt.tm_mon:02d}\\.{lt.tm_year} "
+        f"{lt.tm_hour:02d}:{lt.tm_min:02d}:{lt.tm_sec:02d}"
+        f"{_ADMIN}{_esc(admin_name)} \\(`{admin_id}`\\)"
+        f"{_ACTION}{_esc(action)}"
+    ))
+
 
 async def log_admin_action(
     bot: Bot,
@@ -22,8 +209,9 @@ async def log_admin_action(
 ) -> None:
     """
     Centralized logging helper that posts formatted messages to the configured log group.
-    No-ops silently if LOG_GROUP_ID is not set.
-    
+    Entries are queued and flushed in batches by a background task, so callers
+    never pay the Telegram round-trip. No-ops silently if LOG_GROUP_ID is not set.
+
     Args:
         bot: Bot instance for sending messages
         admin_id: Telegram ID of the admin performing the action
@@ -32,48 +220,21 @@ async def log_admin_action(
         details: Additional details about the action
         target_user_id: User ID affected by the action (if applicable)
     """
+    # Common shape: no details, no target — take the specialized fast path
+    if details is None and target_user_id is None:
+        await log_admin_action_fast(bot, admin_id, admin_name, action)
+        return
+
     # If no log group is configured, silently return
-    if not admin_config.log_group_id:
-        logger.debug(f"Admin action logged (no log group): {action} by {admin_name} ({admin_id})")
+    if not _get_log_group_id():
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Admin action logged (no log group): %s by %s (%s)", action, admin_name, admin_id)
         return
-    
-    try:
-        # Format timestamp
-        timestamp = datetime.now().strftime("%d.%m.%Y %H:%M:%S")
-        
-        # Build log message
-        log_parts = [
-            "🔧 *Admin Action Log*",
-            "",
-            f"⏰ *Time:* {escape_markdown(timestamp)}",
-            f"👤 *Admin:* {escape_markdown(admin_name)} \\(`{admin_id}`\\)",
-            f"⚡️ *Action:* {escape_markdown(action)}"
-        ]
-        
-        if target_user_id:
-            log_parts.append(f"🎯 *Target User:* `{target_user_id}`")
-        
-        if details:
-            log_parts.append(f"📝 *Details:* {escape_markdown(details)}")
-        
-        log_message = "\n".join(log_parts)
-        
-        # Send to log group
-        await bot.send_message(
-            chat_id=admin_config.log_group_id,
-            text=log_message,
-            parse_mode=ParseMode.MARKDOWN_V2
-        )
-        
-        logger.info(f"Admin action logged to group: {action} by {admin_name}")
-        
-    except TelegramAPIError as e:
-        # Log error but don't fail the operation
-        logger.error(f"Failed to send admin action log: {e}")
-    except Exception as e:
-        logger.error(f"Unexpected error in log_admin_action: {e}")
-
-
-def escape_markdown(text: str) -> str:
-    """Backward-compatible helper that delegates to escape_markdown_v2."""
-    return escape_markdown_v2(text)
+
+    # Enqueue and return immediately — the caller never waits on network I/O.
+    # On overflow, the oldest entry is dropped to make room (backpressure policy).
+    _enqueue(bot, _format_log_entry(admin_id, admin_name, action, details, target_user_id))
+
+
+# Backward-compatible name for the memoized escaper defined at module top.
+escape_markdown = _esc
@@ -1,21 +1,243 @@
+import asyncio
+import hashlib
 import logging
+import re
+import time
+from datetime import datetime, timedelta
+from functools import lru_cache
+from string import Template
 from typing import Optional
 
 from aiogram import Router, F
-from aiogram.filters import Command
-from aiogram.types import Message, CallbackQuery, InlineKeyboardButton
+from aiogram.filters import Command, Filter
+from aiogram.types import Message, CallbackQuery, InlineKeyboardButton, InlineKeyboardMarkup
 from aiogram.utils.keyboard import InlineKeyboardBuilder
 from aiogram.enums import ParseMode
 from aiogram.exceptions import TelegramBadRequest
 
 from admin_roles import AdminRole, get_user_role, require_role, is_admin
+from bot_mode_service import BotMode, get_mode_emoji, get_mode_display_name, get_mode_description
+import bot_mode_service as _bot_mode
+# log_admin_action enqueues onto admin_logger's batching queue and returns
+# immediately; awaiting it in handlers does not block on Telegram I/O.
 from admin_logger import log_admin_action
 from markdown_utils import escape_markdown_v2
+import subscription_service
 
 logger = logging.getLogger(__name__)
 
 escape_markdown = escape_markdown_v2
 
+# MarkdownV2 characters that require escaping; used to skip the full escape
+# pass for strings (usernames, counters) that contain none of them
+_MD2_SPECIAL = frozenset("_*[]()~`>#+-=|{}.!\\")
+
+
+def _esc(text: str) -> str:
+    """escape_markdown with a scan-first fast path for clean ASCII fields."""
+    if not any(c in _MD2_SPECIAL for c in text):
+        return text
+    return escape_markdown(text)
+
+
+# Strong references to fire-and-forget background tasks so they aren't GC'd
+_bg_tasks: set = set()
+
+# Status icons for list rows, indexed by (is_blocked << 1) | is_premium so the
+# per-row render is a single lookup instead of list building and joins
+def _fmt_date(dt: datetime) -> str:
+    """Render DD.MM.YYYY with the dots pre-escaped for MarkdownV2."""
+    return f"{dt.day:02d}\\.{dt.month:02d}\\.{dt.year}"
+
+
+def _fmt_datetime(dt: datetime) -> str:
+    """Render DD.MM.YYYY HH:MM with the dots pre-escaped for MarkdownV2."""
+    return f"{_fmt_date(dt)} {dt.hour:02d}:{dt.minute:02d}"
+
+
+def _iso_to_ddmmyyyy(s: str) -> str:
+    """
+    DD.MM.YYYY (dots escaped) sliced straight out of an ISO-8601 string.
+
+    The DB serializes these fields with a canonical YYYY-MM-DD prefix, so
+    date-only rendering needs no datetime parse at all; keep fromisoformat
+    only where the time portion matters.
+    """
+    return f"{s[8:10]}\\.{s[5:7]}\\.{s[0:4]}"
+
+
+_STATUS_ICONS = ("", "⭐", "🚫", "🚫 ⭐")
+
+# Short-TTL cache for user rows: admins bounce between the list and the same
+# user cards repeatedly, so serve repeat fetches from memory for a few seconds.
+_USER_CACHE_TTL = 10.0
+_user_fetch_cache: dict[int, tuple[float, dict]] = {}
+
+
+async def _get_user_cached(user_id: int, ttl: float = _USER_CACHE_TTL) -> Optional[dict]:
+    """Fetch a user row, serving repeats from a short-TTL in-process cache."""
+    cached = _user_fetch_cache.get(user_id)
+    if cached and time.monotonic() - cached[0] < ttl:
+        return cached[1]
+    user = await database.get_user(user_id)
+    if user is not None:
+        _user_fetch_cache[user_id] = (time.monotonic(), user)
+    return user
+
+
+def _invalidate_user_cache(user_id: int) -> None:
+    """Drop a cached user row after a mutation (premium, block, etc.)."""
+    _user_fetch_cache.pop(user_id, None)
+
+
+# The full user card needs three reads (user row, vehicle binding, daily
+# usage). Admins re-render the same card after every action, so cache the
+# triple together for a short window and drop it on any mutation.
+_USER_CARD_CACHE_TTL = 30.0
+_user_card_cache: dict[int, tuple[float, tuple]] = {}
+
+
+async def _load_user_card(user_id: int, ttl: float = _USER_CARD_CACHE_TTL) -> tuple:
+    """Fetch (user, binding, daily_usage) for a card, with a short-TTL cache."""
+    cached = _user_card_cache.get(user_id)
+    if cached and time.monotonic() - cached[0] < ttl:
+        return cached[1]
+    # The three reads are independent, so overlap them instead of paying
+    # three sequential round-trips
+    user, binding, usage = await asyncio.gather(
+        database.get_user(user_id),
+        database.get_vehicle_binding(user_id),
+        database.get_daily_usage(user_id)
+    )
+    data = (user, binding, usage)
+    if user is not None:
+        _user_card_cache[user_id] = (time.monotonic(), data)
+    return data
+
+
+def _invalidate_user_card(user_id: int) -> None:
+    """Drop cached card data after a mutation affecting the user."""
+    _user_card_cache.pop(user_id, None)
+    _invalidate_user_cache(user_id)
+
+
+# In-process cache for read-dominated bot settings. Writes go through
+# _set_setting_cached so the cache stays coherent without read-after-write races.
+_SETTINGS_CACHE_TTL = 30.0
+_settings_cache: dict[str, tuple[float, object]] = {}
+
+
+async def _get_setting_cached(key: str, ttl: float = _SETTINGS_CACHE_TTL):
+    """Fetch a bot setting, serving repeats from a short-TTL in-process cache."""
+    cached = _settings_cache.get(key)
+    if cached and time.monotonic() - cached[0] < ttl:
+        return cached[1]
+    value = await database.get_setting(key)
+    _settings_cache[key] = (time.monotonic(), value)
+    return value
+
+
+async def _set_setting_cached(key: str, value, value_type: str, description: str) -> None:
+    """Persist a bot setting and update the in-process cache in one step."""
+    await database.set_setting(key, value, value_type, description)
+    _settings_cache[key] = (time.monotonic(), value)
+
+
+@lru_cache(maxsize=256)
+def _resolve_admin_name(first_name, last_name, username) -> str:
+    """Build the display name once per distinct (first, last, username) tuple."""
+    name = f"{first_name or ''} {last_name or ''}".strip()
+    return name or username or "Unknown"
+
+
+def _admin_display_name(user) -> str:
+    """Display name for the acting admin: full name, else username, else Unknown."""
+    return _resolve_admin_name(user.first_name, user.last_name, user.username)
+
+async def _log_admin_action_both(
+    admin_user,
+    action: str,
+    details: str,
+    target_user_id: int,
+    action_type: str,
+    action_details: dict,
+) -> None:
+    """
+    Fan one admin action out to the Telegram log group and the DB audit
+    table concurrently. Failures are logged but never propagated, so a
+    Telegram outage cannot drop the audit row (or vice versa).
+    """
+    coros = [database.log_admin_action(
+        admin_user_id=admin_user.id,
+        action_type=action_type,
+        target_user_id=target_user_id,
+        action_details=action_details
+    )]
+    if bot_instance:
+        coros.append(log_admin_action(
+            bot=bot_instance,
+            admin_id=admin_user.id,
+            admin_name=_admin_display_name(admin_user),
+            action=action,
+            details=details,
+            target_user_id=target_user_id
+        ))
+    results = await asyncio.gather(*coros, return_exceptions=True)
+    for res in results:
+        if isinstance(res, Exception):
+            logger.error("Admin action log failed (%s): %s", action_type, res)
+
+
+async def _notify_and_edit(
+    callback: CallbackQuery,
+    user_id: int,
+    notification_text: str,
+    edit_text: str,
+) -> None:
+    """
+    Send a user notification and update the admin's message concurrently.
+    The two Telegram calls are independent, so they run under one gather;
+    either failing is logged without aborting the other.
+    """
+    if bot_instance is None:
+        await safe_edit_message(callback, edit_text, parse_mode=ParseMode.MARKDOWN_V2)
+        return
+    send_result, edit_result = await asyncio.gather(
+        _send_limited(
+            chat_id=user_id,
+            text=notification_text,
+            parse_mode=ParseMode.MARKDOWN_V2
+        ),
+        safe_edit_message(callback, edit_text, parse_mode=ParseMode.MARKDOWN_V2),
+        return_exceptions=True
+    )
+    if isinstance(send_result, BaseException):
+        logger.error(f"Error sending user notification: {send_result}")
+    if isinstance(edit_result, BaseException):
+        logger.error(f"Error updating admin message: {edit_result}")
+
+
+def _client_cb_args(data: str) -> tuple:
+    """
+    Parse "admin_clients:<action>:<user_id>[:<arg>]" in one pass.
+
+    Returns (action, user_id, arg); user_id/arg are None when missing or
+    malformed, which callers treat as an invalid callback. Centralizes the
+    split + int conversion that was copy-pasted across the client handlers.
+    """
+    parts = data.split(":", 3)
+    action = parts[1] if len(parts) > 1 else ""
+    try:
+        user_id = int(parts[2]) if len(parts) > 2 else None
+    except ValueError:
+        user_id = None
+    try:
+        arg = int(parts[3]) if len(parts) > 3 else None
+    except ValueError:
+        arg = None
+    return action, user_id, arg
+
+
 # Create dedicated router for admin panel
 admin_router = Router()
 
@@ -23,15 +245,210 @@ admin_router = Router()
 database = None
 bot_instance = None
 
-# Simple state manager for multi-step operations
-_admin_state_store: dict[int, dict] = {}
+# Simple state manager for multi-step operations.
+# Entries carry a deadline so abandoned conversations expire instead of
+# leaking forever; a background sweep started in set_admin_dependencies
+# drops anything older than the TTL.
+_ADMIN_STATE_TTL = 300.0
+_ADMIN_STATE_MAXSIZE = 1024
+_admin_state_store: dict[int, tuple[float, dict]] = {}
+_state_gc_task: Optional[asyncio.Task] = None
+
+
+def _state_set(admin_id: int, data: dict, ttl: float = _ADMIN_STATE_TTL) -> None:
+    """Store pending multi-step state for an admin with an expiry deadline."""
+    if len(_admin_state_store) >= _ADMIN_STATE_MAXSIZE and admin_id not in _admin_state_store:
+        # Hard size bound in case the periodic sweep has not run yet:
+        # evict the entry closest to expiry
+        oldest = min(_admin_state_store, key=lambda uid: _admin_state_store[uid][0])
+        del _admin_state_store[oldest]
+        logger.debug("Evicted pending admin state for %s (store full)", oldest)
+    _admin_state_store[admin_id] = (time.monotonic() + ttl, data)
+
+
+def _state_get(admin_id: int) -> Optional[dict]:
+    """Return pending state for an admin, evicting it if expired."""
+    entry = _admin_state_store.get(admin_id)
+    if entry is None:
+        return None
+    deadline, data = entry
+    if time.monotonic() > deadline:
+        del _admin_state_store[admin_id]
+        return None
+    return data
+
+
+def _state_pop(admin_id: int) -> Optional[dict]:
+    """Remove and return pending state for an admin, if any (and not expired)."""
+    entry = _admin_state_store.pop(admin_id, None)
+    if entry is None or time.monotonic() > entry[0]:
+        return None
+    return entry[1]
+
+
+async def _state_gc_loop(interval: float = 60.0) -> None:
+    """Periodically sweep expired admin states to bound memory."""
+    while True:
+        await asyncio.sleep(interval)
+        now = time.monotonic()
+        expired = [uid for uid, (deadline, _) in _admin_state_store.items() if now > deadline]
+        for uid in expired:
+            _admin_state_store.pop(uid, None)
+
+# Static MarkdownV2 texts and templates, assembled once at import so hot
+# handlers don't rebuild the literal scaffolding on every call
+_ACCESS_DENIED_TEXT = (
+    "⛔ *Доступ запрещён*\n\n"
+    "У вас нет прав доступа к панели администратора\\."
+)
+
+_SEARCH_USAGE_TEXT = (
+    "❌ *Укажите USER\\_ID пользователя*\n\n"
+    "Использование: `/admin_search USER_ID`\n\n"
+    "💡 Пример: `/admin_search 7240463796`"
+)
+
+_SEARCH_BAD_FMT_TEXT = (
+    "❌ *Неверный формат USER\\_ID*\n\n"
+    "USER\\_ID должен быть числом\\.\n\n"
+    "💡 Пример: `/admin_search 7240463796`"
+)
+
+_USER_CARD_TMPL = Template(
+    "👤 *Пользователь найден*\n\n"
+    "🆔 *ID:* `$uid`\n"
+    "👤 *Имя:* $name\n"
+    "📱 *Username:* @$username\n"
+    "$status_emoji *Статус:* $status\n"
+    "📅 *Регистрация:* $reg_date\n"
+    "📆 *Подписка:* $sub_info\n"
+    "🚗 *Привязка авто:* $binding\n\n"
+    "*📊 Статистика:*\n"
+    "• Запросов сегодня: $usage\n"
+)
+
+_WELCOME_TMPL = Template(
+    "🔐 *Панель администратора*\n\n"
+    "👤 *Администратор:* $name\n"
+    "🎭 *Роль:* $role\n"
+    "🆔 *ID:* `$uid`\n\n"
+    "Выберите раздел для управления:"
+)
+
+_ROLE_NAMES = {
+    AdminRole.ADMIN: "Администратор",
+    AdminRole.CO: "Со-Администратор",
+    AdminRole.RND: "R&D Администратор"
+}
+
+# Pre-escaped MarkdownV2 forms of the low-cardinality display strings, so
+# rendering never re-escapes a role, mode or section name at runtime
+_ROLE_NAMES_ESC = {role: escape_markdown_v2(name) for role, name in _ROLE_NAMES.items()}
+_MODE_NAMES_ESC = {mode: escape_markdown_v2(get_mode_display_name(mode)) for mode in BotMode}
+_MODE_DESCS_ESC = {mode: escape_markdown_v2(get_mode_description(mode)) for mode in BotMode}
+_OPT_STATUS_ESC = (escape_markdown_v2("Выключена"), escape_markdown_v2("Включена"))
+
+# Fixed fallback strings escaped once at import time — these look dynamic at
+# the call sites but never change, so re-escaping them per render is wasted work
+_UNKNOWN_DATE_ESC = escape_markdown_v2("неизвестно")
+_NO_BINDING_ESC = escape_markdown_v2("нет привязки")
+_NO_ACTIVE_SUB_ESC = escape_markdown_v2("нет активной")
+_N_A_ESC = "N/A"  # contains no MarkdownV2 specials; kept for symmetry
+
+# Short-TTL cache for role lookups: every admin callback re-resolves the role,
+# and it changes rarely, so serve repeats from memory for up to a minute.
+_ROLE_CACHE_TTL = 60.0
+_role_cache: dict[int, tuple[float, AdminRole]] = {}
+
+
+def _get_user_role_cached(user_id: int) -> AdminRole:
+    """Resolve the user's role, serving repeat lookups from a 60s TTL cache."""
+    cached = _role_cache.get(user_id)
+    now = time.monotonic()
+    if cached and now - cached[0] < _ROLE_CACHE_TTL:
+        return cached[1]
+    role = get_user_role(user_id)
+    _role_cache[user_id] = (now, role)
+    return role
+
+
+def invalidate_role_cache(user_id: Optional[int] = None) -> None:
+    """Drop cached role(s) after admin assignments change."""
+    if user_id is None:
+        _role_cache.clear()
+    else:
+        _role_cache.pop(user_id, None)
+
+
+class _TokenBucket:
+    """
+    Token bucket for outgoing Telegram calls, refilled continuously from
+    time.monotonic(). Handlers acquire a token before each send/edit, so
+    bursts (many admins clicking at once) drain at a steady rate just under
+    the bot-wide 30 msg/s cap instead of tripping 429 retry-sleeps.
+    """
+    __slots__ = ("rate", "capacity", "_tokens", "_updated", "_lock")
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= 1.0:
+                self._tokens -= 1.0
+                return
+            wait = (1.0 - self._tokens) / self.rate
+            self._tokens = 0.0
+            self._updated = now + wait
+            await asyncio.sleep(wait)
+
+
+# 28/s leaves headroom under Telegram's 30 msg/s bot-wide limit for the
+# log-group writer and the client bot sharing the same token
+_tg_limiter = _TokenBucket(rate=28.0, capacity=28.0)
+
+
+async def _send_limited(**kwargs):
+    """bot_instance.send_message behind the global token bucket."""
+    await _tg_limiter.acquire()
+    return await bot_instance.send_message(**kwargs)
+
+
+# Hash of the last content rendered per message, so a refresh that produces
+# identical output skips the editMessageText round-trip instead of relying
+# on Telegram's "message is not modified" error to reject it
+_EDIT_HASH_MAXSIZE = 512
+# Keyed by (chat_id, message_id): message_ids are only unique within a chat,
+# so two admin chats can hold the same id with different content
+_edit_hash_cache: dict[tuple[int, int], bytes] = {}
+
+
+def _edit_digest(text: str, reply_markup) -> bytes:
+    """Digest of text + markup, the content Telegram compares on edit."""
+    payload = text if reply_markup is None else text + reply_markup.model_dump_json()
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).digest()
 
 
 async def safe_edit_message(callback: CallbackQuery, text: str, reply_markup=None, parse_mode=None):
     """
     Safely edit a message, catching TelegramBadRequest if message is not modified.
     This prevents errors when trying to edit a message with the same content.
+    Skips the API call entirely when the content is identical to what was
+    last rendered for this message.
     """
+    cache_key = (callback.message.chat.id, callback.message.message_id)
+    digest = _edit_digest(text, reply_markup)
+    if _edit_hash_cache.get(cache_key) == digest:
+        logger.debug("Message %s unchanged, skipping edit", cache_key)
+        return
+    await _tg_limiter.acquire()
     try:
         await callback.message.edit_text(
             text=text,
@@ -43,6 +460,10 @@ async def safe_edit_message(callback: CallbackQuery, text: str, reply_markup=Non
             logger.debug(f"Message not modified, skipping edit: {e}")
         else:
             raise
+    if len(_edit_hash_cache) >= _EDIT_HASH_MAXSIZE:
+        # Drop the oldest insertion to stay bounded
+        _edit_hash_cache.pop(next(iter(_edit_hash_cache)))
+    _edit_hash_cache[cache_key] = digest
 
 
 def set_admin_dependencies(db, bot):
@@ -50,9 +471,11 @@ def set_admin_dependencies(db, bot):
     Set database and bot dependencies for admin panel.
     Should be called during bot initialization.
     """
-    global database, bot_instance
+    global database, bot_instance, _state_gc_task
     database = db
     bot_instance = bot
+    if _state_gc_task is None or _state_gc_task.done():
+        _state_gc_task = asyncio.create_task(_state_gc_loop())
 
 
 class AdminSection:
@@ -63,41 +486,71 @@ class AdminSection:
     SETTINGS = "settings"
 
 
+# Minimum role required for each section, in menu order.
+# Kept as a module-level tuple so menu building iterates constant data.
+_SECTION_PERMS: tuple[tuple[str, AdminRole], ...] = (
+    (AdminSection.GENERAL, AdminRole.RND),     # All admins can access
+    (AdminSection.CLIENTS, AdminRole.RND),     # All admins can access (write ops require CO+)
+    (AdminSection.PAYMENTS, AdminRole.CO),     # Co-Admins and above
+    (AdminSection.SETTINGS, AdminRole.ADMIN),  # Full admins only
+)
+
+
 def get_section_permissions() -> dict[str, AdminRole]:
     """
     Define minimum role required for each section.
-    
+
     Returns:
         Dictionary mapping section name to minimum required role
     """
-    return {
-        AdminSection.GENERAL: AdminRole.RND,     # All admins can access
-        AdminSection.CLIENTS: AdminRole.RND,     # All admins can access (write ops require CO+)
-        AdminSection.PAYMENTS: AdminRole.CO,     # Co-Admins and above
-        AdminSection.SETTINGS: AdminRole.ADMIN,  # Full admins only
-    }
+    return dict(_SECTION_PERMS)
+
+
+# Section decoration maps, hoisted so lookups don't allocate a fresh dict per call
+_SECTION_EMOJIS = {
+    AdminSection.GENERAL: "📊",
+    AdminSection.CLIENTS: "👥",
+    AdminSection.PAYMENTS: "💰",
+    AdminSection.SETTINGS: "⚙️"
+}
+
+_SECTION_NAMES = {
+    AdminSection.GENERAL: "Общая информация",
+    AdminSection.CLIENTS: "Управление клиентами",
+    AdminSection.PAYMENTS: "Платежные системы",
+    AdminSection.SETTINGS: "Настройки системы"
+}
+
+
+_SECTION_NAMES_ESC = {section: escape_markdown_v2(name) for section, name in _SECTION_NAMES.items()}
+
+# Shared back-to-menu markup plus the fully rendered "under construction"
+# texts: both depend only on the section, so they are built once at import
+# and the fallback section handler just looks them up
+_BACK_TO_MENU_MARKUP = InlineKeyboardMarkup(inline_keyboard=[[
+    InlineKeyboardButton(text="◀️ Назад в меню", callback_data="admin_back_to_menu")
+]])
+
+_CONSTRUCTION_TEXTS = {
+    section: (
+        f"{_SECTION_EMOJIS[section]} *{_SECTION_NAMES_ESC[section]}*\n\n"
+        "🚧 *Раздел в разработке*\n\n"
+        "Данный функционал находится в процессе разработки "
+        "и будет доступен в ближайшее время\\.\n\n"
+        "_Следите за обновлениями\\!_"
+    )
+    for section in _SECTION_NAMES
+}
 
 
 def get_section_emoji(section: str) -> str:
     """Get emoji for section"""
-    emojis = {
-        AdminSection.GENERAL: "📊",
-        AdminSection.CLIENTS: "👥",
-        AdminSection.PAYMENTS: "💰",
-        AdminSection.SETTINGS: "⚙️"
-    }
-    return emojis.get(section, "📁")
+    return _SECTION_EMOJIS.get(section, "📁")
 
 
 def get_section_name(section: str) -> str:
     """Get display name for section"""
-    names = {
-        AdminSection.GENERAL: "Общая информация",
-        AdminSection.CLIENTS: "Управление клиентами",
-        AdminSection.PAYMENTS: "Платежные системы",
-        AdminSection.SETTINGS: "Настройки системы"
-    }
-    return names.get(section, section.title())
+    return _SECTION_NAMES.get(section, section.title())
 
 
 def build_admin_menu(user_role: AdminRole) -> InlineKeyboardBuilder:
@@ -111,11 +564,10 @@ def build_admin_menu(user_role: AdminRole) -> InlineKeyboardBuilder:
         InlineKeyboardBuilder with appropriate buttons
     """
     builder = InlineKeyboardBuilder()
-    permissions = get_section_permissions()
-    
+
     # Add buttons for sections user has access to
     available_sections = []
-    for section, required_role in permissions.items():
+    for section, required_role in _SECTION_PERMS:
         if user_role >= required_role:
             emoji = get_section_emoji(section)
             name = get_section_name(section)
@@ -132,10 +584,20 @@ def build_admin_menu(user_role: AdminRole) -> InlineKeyboardBuilder:
     # Add close button
     builder.row()
     builder.button(text="❌ Закрыть", callback_data="admin_close")
-    
+
     return builder
 
 
+@lru_cache(maxsize=8)
+def _build_admin_menu_markup(user_role: AdminRole):
+    """
+    Cached menu markup per role: the menu depends only on the role, so the
+    fully-built InlineKeyboardMarkup is computed once and reused on every
+    /admin invocation and back-navigation.
+    """
+    return build_admin_menu(user_role).as_markup()
+
+
 @admin_router.message(Command("admin_search"))
 async def cmd_admin_search(message: Message):
     """
@@ -143,13 +605,12 @@ async def cmd_admin_search(message: Message):
     Usage: /admin_search <user_id>
     """
     user_id = message.from_user.id
-    user_role = get_user_role(user_id)
+    user_role = _get_user_role_cached(user_id)
     
     # Check if user has any admin role
     if user_role < AdminRole.RND:
         await message.answer(
-            "⛔ *Доступ запрещён*\n\n"
-            "У вас нет прав доступа к панели администратора\\.",
+            _ACCESS_DENIED_TEXT,
             parse_mode=ParseMode.MARKDOWN_V2
         )
         return
@@ -158,9 +619,7 @@ async def cmd_admin_search(message: Message):
     args = message.text.split(maxsplit=1)
     if len(args) < 2:
         await message.answer(
-            "❌ *Укажите USER\\_ID пользователя*\n\n"
-            "Использование: `/admin_search USER_ID`\n\n"
-            "💡 Пример: `/admin_search 7240463796`",
+            _SEARCH_USAGE_TEXT,
             parse_mode=ParseMode.MARKDOWN_V2
         )
         return
@@ -170,9 +629,7 @@ async def cmd_admin_search(message: Message):
     # Validate user ID format (must be a number)
     if not user_id_str.isdigit():
         await message.answer(
-            "❌ *Неверный формат USER\\_ID*\n\n"
-            "USER\\_ID должен быть числом\\.\n\n"
-            "💡 Пример: `/admin_search 7240463796`",
+            _SEARCH_BAD_FMT_TEXT,
             parse_mode=ParseMode.MARKDOWN_V2
         )
         return
@@ -181,7 +638,7 @@ async def cmd_admin_search(message: Message):
     
     # Search for user in database
     try:
-        user = await database.get_user(search_user_id)
+        user = await _get_user_cached(search_user_id)
         
         if not user:
             await message.answer(
@@ -195,49 +652,49 @@ async def cmd_admin_search(message: Message):
             )
             return
         
-        # Get additional information
-        subscription = await database.get_active_subscription(search_user_id)
-        binding = await database.get_vehicle_binding(search_user_id)
-        current_usage = await database.get_daily_usage(search_user_id)
+        # Get additional information — the three reads are independent, so
+        # overlap them instead of paying three sequential round-trips
+        subscription, binding, current_usage = await asyncio.gather(
+            database.get_active_subscription(search_user_id),
+            database.get_vehicle_binding(search_user_id),
+            database.get_daily_usage(search_user_id)
+        )
         
         # Format registration date
         created_at = user.get('created_at', '')
         if created_at:
             try:
-                from datetime import datetime
                 if isinstance(created_at, str):
                     dt = datetime.fromisoformat(created_at)
-                    reg_date = dt.strftime('%d.%m.%Y %H:%M')
+                    reg_date = escape_markdown(dt.strftime('%d.%m.%Y %H:%M'))
                 else:
-                    reg_date = created_at.strftime('%d.%m.%Y %H:%M')
+                    reg_date = escape_markdown(created_at.strftime('%d.%m.%Y %H:%M'))
             except:
-                reg_date = 'неизвестно'
+                reg_date = _UNKNOWN_DATE_ESC
         else:
-            reg_date = 'неизвестно'
+            reg_date = _UNKNOWN_DATE_ESC
         
         # Format subscription info
         if subscription:
             expires_at = subscription.get('expires_at', '')
             try:
-                from datetime import datetime
                 if isinstance(expires_at, str):
                     dt = datetime.fromisoformat(expires_at)
-                    sub_info = f"до {dt.strftime('%d.%m.%Y')}"
+                    sub_info = escape_markdown(f"до {dt.strftime('%d.%m.%Y')}")
                 else:
-                    sub_info = f"до {expires_at.strftime('%d.%m.%Y')}"
+                    sub_info = escape_markdown(f"до {expires_at.strftime('%d.%m.%Y')}")
             except:
                 sub_info = "активна"
         else:
-            sub_info = "нет активной"
+            sub_info = _NO_ACTIVE_SUB_ESC
         
         # Format binding info
-        binding_info = "нет привязки"
+        binding_info = _NO_BINDING_ESC
         if binding:
-            plate = binding.get('plate_number', 'N/A')
-            binding_info = f"{plate}"
+            binding_info = escape_markdown(binding.get('plate_number', _N_A_ESC))
         
         # Build user info text
-        first_name = user.get('first_name', 'N/A')
+        first_name = user.get('first_name', _N_A_ESC)
         last_name = user.get('last_name', '') or ''
         username = user.get('username', 'не указан')
         is_premium = user.get('is_premium', False)
@@ -250,17 +707,16 @@ async def cmd_admin_search(message: Message):
             status_emoji = "🚫"
             status_text = "Заблокирован"
         
-        text = (
-            "👤 *Пользователь найден*\n\n"
-            f"🆔 *ID:* `{search_user_id}`\n"
-            f"👤 *Имя:* {escape_markdown(f'{first_name} {last_name}'.strip())}\n"
-            f"📱 *Username:* @{escape_markdown(username)}\n"
-            f"{status_emoji} *Статус:* {escape_markdown(status_text)}\n"
-            f"📅 *Регистрация:* {escape_markdown(reg_date)}\n"
-            f"📆 *Подписка:* {escape_markdown(sub_info)}\n"
-            f"🚗 *Привязка авто:* {escape_markdown(binding_info)}\n\n"
-            f"*📊 Статистика:*\n"
-            f"• Запросов сегодня: {escape_markdown(str(current_usage))}\n"
+        text = _USER_CARD_TMPL.substitute(
+            uid=search_user_id,
+            name=escape_markdown(f'{first_name} {last_name}'.strip()),
+            username=_esc(username),
+            status_emoji=status_emoji,
+            status=escape_markdown(status_text),
+            reg_date=reg_date,
+            sub_info=sub_info,
+            binding=binding_info,
+            usage=current_usage
         )
         
         # Build management keyboard
@@ -288,9 +744,7 @@ async def cmd_admin_search(message: Message):
         
         # Log admin action
         if bot_instance:
-            admin_name = f"{message.from_user.first_name or ''} {message.from_user.last_name or ''}".strip()
-            if not admin_name:
-                admin_name = message.from_user.username or "Unknown"
+            admin_name = _admin_display_name(message.from_user)
             
             await log_admin_action(
                 bot=bot_instance,
@@ -300,10 +754,8 @@ async def cmd_admin_search(message: Message):
                 details=f"Searched for user ID: {search_user_id}"
             )
         
-    except Exception as e:
-        logger.error(f"Error in admin search: {e}")
-        import traceback
-        traceback.print_exc()
+    except Exception:
+        logger.exception("Error in admin search")
         await message.answer("❌ Ошибка при поиске пользователя")
 
 
@@ -314,58 +766,45 @@ async def cmd_admin(message: Message):
     Verifies role, fetches user record from DB, and renders inline menu.
     """
     user_id = message.from_user.id
-    user_role = get_user_role(user_id)
+    user_role = _get_user_role_cached(user_id)
     
     # Check if user has any admin role
     if user_role == AdminRole.NONE:
         await message.answer(
-            "⛔ *Доступ запрещён*\n\n"
-            "У вас нет прав доступа к панели администратора\\.",
+            _ACCESS_DENIED_TEXT,
             parse_mode=ParseMode.MARKDOWN_V2
         )
         return
     
-    # Fetch user record from database
-    user_record = None
+    # Ensure the admin exists in the users table, but don't hold up the menu:
+    # the record isn't used for rendering, so run the upsert in the background
     if database:
-        try:
-            user_record = await database.get_or_create_user(
-                user_id=user_id,
-                username=message.from_user.username,
-                first_name=message.from_user.first_name,
-                last_name=message.from_user.last_name
-            )
-        except Exception as e:
-            logger.error(f"Error fetching user record for admin {user_id}: {e}")
-    
-    # Get role name
-    role_names = {
-        AdminRole.ADMIN: "Администратор",
-        AdminRole.CO: "Со-Администратор",
-        AdminRole.RND: "R&D Администратор"
-    }
-    role_name = role_names.get(user_role, "Unknown")
+        task = asyncio.create_task(database.get_or_create_user(
+            user_id=user_id,
+            username=message.from_user.username,
+            first_name=message.from_user.first_name,
+            last_name=message.from_user.last_name
+        ))
+        _bg_tasks.add(task)
+        task.add_done_callback(_bg_tasks.discard)
     
+    role_name = _ROLE_NAMES.get(user_role, "Unknown")
+
     # Build welcome message
     username = message.from_user.username or "Unknown"
     first_name = message.from_user.first_name or ""
     last_name = message.from_user.last_name or ""
     full_name = f"{first_name} {last_name}".strip() or username
-    
-    welcome_text = (
-        "🔐 *Панель администратора*\n\n"
-        f"👤 *Администратор:* {escape_markdown(full_name)}\n"
-        f"🎭 *Роль:* {escape_markdown(role_name)}\n"
-        f"🆔 *ID:* `{user_id}`\n\n"
-        "Выберите раздел для управления:"
+
+    welcome_text = _WELCOME_TMPL.substitute(
+        name=escape_markdown(full_name),
+        role=_ROLE_NAMES_ESC.get(user_role, "Unknown"),
+        uid=user_id
     )
     
-    # Build menu with sections available to this role
-    menu = build_admin_menu(user_role)
-    
     await message.answer(
         welcome_text,
-        reply_markup=menu.as_markup(),
+        reply_markup=_build_admin_menu_markup(user_role),
         parse_mode=ParseMode.MARKDOWN_V2
     )
     
@@ -388,19 +827,16 @@ async def handle_general_section(callback: CallbackQuery):
     """
     Handle General section - shows bot mode, optimization and allows switching
     """
-    from bot_mode_service import bot_mode_service, BotMode, get_mode_emoji, get_mode_display_name, get_mode_description
-    
-    if not bot_mode_service:
+    mode_service = _bot_mode.bot_mode_service
+    if not mode_service:
         await callback.answer("❌ Сервис режимов не инициализирован", show_alert=True)
         return
     
     # Get current mode
-    current_mode = await bot_mode_service.get_mode()
+    current_mode = await mode_service.get_mode()
     
     # Build section text
     emoji = get_mode_emoji(current_mode)
-    mode_name = get_mode_display_name(current_mode)
-    mode_desc = get_mode_description(current_mode)
     
     # Ensure database is available
     if not database:
@@ -408,10 +844,10 @@ async def handle_general_section(callback: CallbackQuery):
         return
     
     # Get optimization status
-    raw_optimization = await database.get_setting("optimization_enabled")
+    raw_optimization = await _get_setting_cached("optimization_enabled")
     if raw_optimization is None:
         optimization_enabled = True
-        await database.set_setting(
+        await _set_setting_cached(
             "optimization_enabled",
             True,
             "bool",
@@ -424,13 +860,12 @@ async def handle_general_section(callback: CallbackQuery):
             optimization_enabled = str(raw_optimization).lower() == "true"
     
     opt_status_emoji = "✅" if optimization_enabled else "❌"
-    opt_status_text = "Включена" if optimization_enabled else "Выключена"
     
     section_text = (
         "⚙️ *ОСНОВНЫЕ НАСТРОЙКИ*\n\n"
-        f"📊 *Режим работы:* {emoji} {escape_markdown(mode_name)}\n\n"
-        f"⚡ *Оптимизация загрузки:* {opt_status_emoji} {escape_markdown(opt_status_text)}\n\n"
-        f"📝 _{escape_markdown(mode_desc)}_\n\n"
+        f"📊 *Режим работы:* {emoji} {_MODE_NAMES_ESC[current_mode]}\n\n"
+        f"⚡ *Оптимизация загрузки:* {opt_status_emoji} {_OPT_STATUS_ESC[optimization_enabled]}\n\n"
+        f"📝 _{_MODE_DESCS_ESC[current_mode]}_\n\n"
         "Выберите действие:"
     )
     
@@ -453,63 +888,63 @@ async def handle_general_section(callback: CallbackQuery):
     await callback.answer("Открыт раздел: Основные настройки")
 
 
-@admin_router.callback_query(F.data == "admin_general:change_mode")
+# Mode buttons vary only in which entry carries the "current" marker, so the
+# labels are precomputed once and the finished markup is cached per mode
+_MODE_BUTTONS_BASE = tuple(
+    (mode, f"{get_mode_emoji(mode)} {get_mode_display_name(mode)}", mode.value)
+    for mode in BotMode
+)
+
+
+@lru_cache(maxsize=len(BotMode))
+def _mode_menu_markup(current_mode: BotMode):
+    """Cached mode-selection keyboard with the current mode ticked."""
+    builder = InlineKeyboardBuilder()
+    for mode, label, value in _MODE_BUTTONS_BASE:
+        text = f"{label} ✓" if mode == current_mode else label
+        builder.button(text=text, callback_data=f"admin_general:set_mode:{value}")
+    builder.adjust(2)  # 2 buttons per row
+    builder.row()
+    builder.button(text="◀️ Назад", callback_data="admin_section:general")
+    return builder.as_markup()
+
+
 @require_role(AdminRole.ADMIN)
 async def handle_change_mode_menu(callback: CallbackQuery):
     """
     Show mode selection menu - Admin only
     """
-    from bot_mode_service import bot_mode_service, BotMode, get_mode_emoji, get_mode_display_name
-    
-    if not bot_mode_service:
+    mode_service = _bot_mode.bot_mode_service
+    if not mode_service:
         await callback.answer("❌ Сервис режимов не инициализирован", show_alert=True)
         return
-    
+
     # Get current mode
-    current_mode = await bot_mode_service.get_mode()
-    
+    current_mode = await mode_service.get_mode()
+
     section_text = (
         "🔄 *Изменение режима бота*\n\n"
-        f"Текущий режим: *{escape_markdown(get_mode_display_name(current_mode))}*\n\n"
+        f"Текущий режим: *{_MODE_NAMES_ESC[current_mode]}*\n\n"
         "Выберите новый режим:"
     )
-    
-    # Build mode selection keyboard
-    builder = InlineKeyboardBuilder()
-    
-    for mode in BotMode:
-        emoji = get_mode_emoji(mode)
-        name = get_mode_display_name(mode)
-        # Mark current mode
-        if mode == current_mode:
-            button_text = f"{emoji} {name} ✓"
-        else:
-            button_text = f"{emoji} {name}"
-        builder.button(text=button_text, callback_data=f"admin_general:set_mode:{mode.value}")
-    
-    builder.adjust(2)  # 2 buttons per row
-    builder.row()
-    builder.button(text="◀️ Назад", callback_data="admin_section:general")
-    
+
     await safe_edit_message(
         callback,
         section_text,
-        reply_markup=builder.as_markup(),
+        reply_markup=_mode_menu_markup(current_mode),
         parse_mode=ParseMode.MARKDOWN_V2
     )
-    
+
     await callback.answer()
 
 
-@admin_router.callback_query(F.data.startswith("admin_general:set_mode:"))
 @require_role(AdminRole.ADMIN)
 async def handle_set_mode(callback: CallbackQuery):
     """
     Set new bot mode and log the change
     """
-    from bot_mode_service import bot_mode_service, BotMode, get_mode_display_name
-    
-    if not bot_mode_service:
+    mode_service = _bot_mode.bot_mode_service
+    if not mode_service:
         await callback.answer("❌ Сервис режимов не инициализирован", show_alert=True)
         return
     
@@ -523,7 +958,7 @@ async def handle_set_mode(callback: CallbackQuery):
         return
     
     # Get old mode for logging
-    old_mode = await bot_mode_service.get_mode()
+    old_mode = await mode_service.get_mode()
     
     # Check if mode is already set
     if new_mode == old_mode:
@@ -533,14 +968,12 @@ async def handle_set_mode(callback: CallbackQuery):
         return
     
     # Set new mode
-    await bot_mode_service.set_mode(new_mode)
+    await mode_service.set_mode(new_mode)
     
     # Log to admin log group
     if bot_instance:
         admin_id = callback.from_user.id
-        admin_name = f"{callback.from_user.first_name or ''} {callback.from_user.last_name or ''}".strip()
-        if not admin_name:
-            admin_name = callback.from_user.username or "Unknown"
+        admin_name = _admin_display_name(callback.from_user)
         
         old_mode_name = get_mode_display_name(old_mode)
         new_mode_name = get_mode_display_name(new_mode)
@@ -560,7 +993,6 @@ async def handle_set_mode(callback: CallbackQuery):
     await handle_general_section(callback)
 
 
-@admin_router.callback_query(F.data == "admin_general:toggle_optimization")
 @require_role(AdminRole.ADMIN)
 async def handle_toggle_optimization(callback: CallbackQuery):
     """
@@ -572,7 +1004,7 @@ async def handle_toggle_optimization(callback: CallbackQuery):
     
     try:
         # Get current setting
-        raw_current = await database.get_setting("optimization_enabled")
+        raw_current = await _get_setting_cached("optimization_enabled")
         if raw_current is None:
             current = True
         elif isinstance(raw_current, bool):
@@ -584,14 +1016,12 @@ async def handle_toggle_optimization(callback: CallbackQuery):
         new_value = not current
         
         # Save to database
-        await database.set_setting("optimization_enabled", new_value, "bool", "Параллельная загрузка медиафайлов")
+        await _set_setting_cached("optimization_enabled", new_value, "bool", "Параллельная загрузка медиафайлов")
         
         # Log action
         if bot_instance:
             admin_id = callback.from_user.id
-            admin_name = f"{callback.from_user.first_name or ''} {callback.from_user.last_name or ''}".strip()
-            if not admin_name:
-                admin_name = callback.from_user.username or "Unknown"
+            admin_name = _admin_display_name(callback.from_user)
             
             await log_admin_action(
                 bot=bot_instance,
@@ -608,14 +1038,11 @@ async def handle_toggle_optimization(callback: CallbackQuery):
         # Refresh view
         await handle_general_section(callback)
         
-    except Exception as e:
-        logger.error(f"Error toggling optimization: {e}")
-        import traceback
-        traceback.print_exc()
+    except Exception:
+        logger.exception("Error toggling optimization")
         await callback.answer("❌ Ошибка при переключении оптимизации", show_alert=True)
 
 
-@admin_router.callback_query(F.data == "admin_general:stats")
 @require_role(AdminRole.RND)
 async def handle_general_stats(callback: CallbackQuery):
     """
@@ -628,32 +1055,38 @@ async def handle_general_stats(callback: CallbackQuery):
     try:
         stats = await database.get_statistics()
         
-        # Build statistics text
-        stats_text = (
+        # Build statistics text as a parts list joined once, instead of
+        # incremental f-string/+= concatenation over a long template
+        parts = [
             "📊 *Статистика бота*\n\n"
             "*Общая информация:*\n"
-            f"👥 Всего пользователей: {escape_markdown(str(stats['total_users']))}\n"
-            f"💎 Premium пользователей: {escape_markdown(str(stats['premium_users']))}\n"
-            f"📱 Обычных пользователей: {escape_markdown(str(stats['regular_users']))}\n"
-            f"⭐ Активных подписок: {escape_markdown(str(stats['active_subscriptions']))}\n\n"
-            "*За сегодня:*\n"
-            f"👤 Новых пользователей: {escape_markdown(str(stats['new_users_today']))}\n"
-            f"🔍 Выполненных запросов: {escape_markdown(str(stats['requests_today']))}\n"
-            f"💎 Новых подписок: {escape_markdown(str(stats['subscriptions_today']))}\n\n"
-            "*Финансы:*\n"
-            f"💳 Всего оплат: {escape_markdown(str(stats['total_payments_count']))} \\({escape_markdown(str(stats['total_payments_amount']))} смн\\)\n"
-            f"⏳ Ожидают подтверждения: {escape_markdown(str(stats['pending_payments_count']))} \\({escape_markdown(str(stats['pending_payments_amount']))} смн\\)\n"
-            f"✅ Подтверждено сегодня: {escape_markdown(str(stats['confirmed_payments_today_count']))} \\({escape_markdown(str(stats['confirmed_payments_today_amount']))} смн\\)\n"
-        )
-        
+            "👥 Всего пользователей: ", str(stats['total_users']),
+            "\n💎 Premium пользователей: ", str(stats['premium_users']),
+            "\n📱 Обычных пользователей: ", str(stats['regular_users']),
+            "\n⭐ Активных подписок: ", str(stats['active_subscriptions']),
+            "\n\n*За сегодня:*\n"
+            "👤 Новых пользователей: ", str(stats['new_users_today']),
+            "\n🔍 Выполненных запросов: ", str(stats['requests_today']),
+            "\n💎 Новых подписок: ", str(stats['subscriptions_today']),
+            "\n\n*Финансы:*\n"
+            "💳 Всего оплат: ", str(stats['total_payments_count']),
+            " \\(", _esc(str(stats['total_payments_amount'])), " смн\\)\n",
+            "⏳ Ожидают подтверждения: ", str(stats['pending_payments_count']),
+            " \\(", _esc(str(stats['pending_payments_amount'])), " смн\\)\n",
+            "✅ Подтверждено сегодня: ", str(stats['confirmed_payments_today_count']),
+            " \\(", _esc(str(stats['confirmed_payments_today_amount'])), " смн\\)\n",
+        ]
+
         # Add top users
         if stats['top_users']:
-            stats_text += "\n*Топ\\-3 активных пользователя:*\n"
+            parts.append("\n*Топ\\-3 активных пользователя:*\n")
             for idx, user in enumerate(stats['top_users'], 1):
                 username = user.get('username', 'N/A')
                 user_id = user.get('user_id')
                 requests = user.get('requests', 0)
-                stats_text += f"{idx}\\. @{escape_markdown(username)} \\(ID: `{user_id}`\\) \\- {escape_markdown(str(requests))} запросов\n"
+                parts.append(f"{idx}\\. @{escape_markdown(username)} \\(ID: `{user_id}`\\) \\- {requests} запросов\n")
+
+        stats_text = "".join(parts)
         
         # Build keyboard
         builder = InlineKeyboardBuilder()
@@ -669,20 +1102,35 @@ async def handle_general_stats(callback: CallbackQuery):
         )
         await callback.answer("Статистика обновлена")
     
-    except Exception as e:
-        logger.error(f"Error fetching statistics: {e}")
-        import traceback
-        traceback.print_exc()
+    except Exception:
+        logger.exception("Error fetching statistics")
         await callback.answer("❌ Ошибка при загрузке статистики", show_alert=True)
 
 
-@admin_router.callback_query(F.data.startswith("admin_general:"))
 @require_role(AdminRole.RND)
 async def handle_general_actions(callback: CallbackQuery):
     """Placeholder for other general section actions"""
     await callback.answer("🚧 В разработке", show_alert=True)
 
 
+# Dispatch table for admin_general:* callbacks: one router filter, one split,
+# one dict lookup — instead of a linear scan over per-action filters.
+_GENERAL_HANDLERS = {
+    "change_mode": handle_change_mode_menu,
+    "set_mode": handle_set_mode,
+    "toggle_optimization": handle_toggle_optimization,
+    "stats": handle_general_stats,
+}
+
+
+@admin_router.callback_query(F.data.startswith("admin_general:"))
+async def dispatch_general_action(callback: CallbackQuery):
+    """Route admin_general:* callbacks through the dispatch table"""
+    action = callback.data.split(":", 2)[1]
+    handler = _GENERAL_HANDLERS.get(action, handle_general_actions)
+    await handler(callback)
+
+
 @admin_router.callback_query(F.data == "admin_section:clients")
 @require_role(AdminRole.RND)
 async def handle_clients_section(callback: CallbackQuery):
@@ -718,7 +1166,6 @@ async def handle_clients_section(callback: CallbackQuery):
     await callback.answer("Открыт раздел: Управление клиентами")
 
 
-@admin_router.callback_query(F.data.startswith("admin_clients:list:"))
 @require_role(AdminRole.RND)
 async def handle_clients_list(callback: CallbackQuery):
     """Show paginated list of users"""
@@ -727,15 +1174,14 @@ async def handle_clients_list(callback: CallbackQuery):
         return
     
     # Parse page number from callback data
-    try:
-        page = int(callback.data.split(":", 2)[2])
-    except (IndexError, ValueError):
+    _, page, _ = _client_cb_args(callback.data)
+    if page is None:
         page = 0
     
     page = max(0, page)  # Ensure non-negative
     
     # Get users from database
-    users, total_count = await database.search_users(limit=10, offset=page * 10)
+    users, has_more = await database.search_users_fast(limit=10, offset=page * 10)
     
     if not users:
         await callback.answer("Пользователи не найдены", show_alert=True)
@@ -748,55 +1194,49 @@ async def handle_clients_list(callback: CallbackQuery):
     
     for idx, user in enumerate(users, start=page * 10 + 1):
         user_id = user['user_id']
-        username = user.get('username') or 'N/A'
-        first_name = user.get('first_name') or ''
-        last_name = user.get('last_name') or ''
-        full_name = f"{first_name} {last_name}".strip() or username
-        
-        status_icons = []
-        if user['is_blocked']:
-            status_icons.append("🚫")
-        if user['is_premium']:
-            status_icons.append("⭐")
-        
-        status_str = " ".join(status_icons) if status_icons else ""
-        
+        full_name = (
+            f"{user.get('first_name') or ''} {user.get('last_name') or ''}".strip()
+            or user.get('username') or 'N/A'
+        )
+        status_str = _STATUS_ICONS[(bool(user['is_blocked']) << 1) | bool(user['is_premium'])]
         text_parts.append(
             f"\n{idx}\\. `{user_id}` \\- {escape_markdown(full_name)} {status_str}"
         )
     
     # Add pagination info
-    total_pages = (total_count + 9) // 10
     current_page = page + 1
-    text_parts.append(f"\n\n📄 Страница {current_page} из {total_pages} \\({total_count} всего\\)")
+    text_parts.append(f"\n\n📄 Страница {current_page}")
     
     list_text = "".join(text_parts)
     
     # Build keyboard with user buttons and pagination
     builder = InlineKeyboardBuilder()
-    
-    # Add user buttons (2 per row)
-    for user in users:
-        user_id = user['user_id']
-        username = user.get('username') or str(user_id)[:8]
-        builder.button(text=f"👤 {username}", callback_data=f"admin_clients:view:{user_id}")
-    
+
+    # Add user buttons in one pass (2 per row)
+    builder.add(*[
+        InlineKeyboardButton(
+            text=f"👤 {user.get('username') or str(user['user_id'])[:8]}",
+            callback_data=f"admin_clients:view:{user['user_id']}"
+        )
+        for user in users
+    ])
     builder.adjust(2)
-    
+
     # Pagination controls
-    nav_row = []
+    nav_buttons = []
     if page > 0:
-        nav_row.append(builder.button(text="◀️ Назад", callback_data=f"admin_clients:list:{page-1}"))
-    if (page + 1) * 10 < total_count:
-        nav_row.append(builder.button(text="Вперёд ▶️", callback_data=f"admin_clients:list:{page+1}"))
-    
-    if nav_row:
-        builder.row()
-    
+        nav_buttons.append(InlineKeyboardButton(text="◀️ Назад", callback_data=f"admin_clients:list:{page-1}"))
+    if has_more:
+        nav_buttons.append(InlineKeyboardButton(text="Вперёд ▶️", callback_data=f"admin_clients:list:{page+1}"))
+
+    if nav_buttons:
+        builder.row(*nav_buttons)
+
     # Back to menu
-    builder.row()
-    builder.button(text="🔍 Поиск", callback_data="admin_clients:search_prompt")
-    builder.button(text="◀️ Назад", callback_data="admin_section:clients")
+    builder.row(
+        InlineKeyboardButton(text="🔍 Поиск", callback_data="admin_clients:search_prompt"),
+        InlineKeyboardButton(text="◀️ Назад", callback_data="admin_section:clients")
+    )
     
     await safe_edit_message(
         callback,
@@ -808,7 +1248,6 @@ async def handle_clients_list(callback: CallbackQuery):
     await callback.answer()
 
 
-@admin_router.callback_query(F.data == "admin_clients:search_prompt")
 @require_role(AdminRole.RND)
 async def handle_search_prompt(callback: CallbackQuery):
     """Prompt user to enter search query"""
@@ -834,152 +1273,175 @@ async def handle_search_prompt(callback: CallbackQuery):
     await callback.answer()
 
 
-@admin_router.callback_query(F.data.startswith("admin_clients:view:"))
-@require_role(AdminRole.RND)
-async def handle_view_client(callback: CallbackQuery):
-    """Show detailed user card with action buttons"""
-    # Clear any pending state when viewing a user
-    admin_id = callback.from_user.id
-    if admin_id in _admin_state_store:
-        del _admin_state_store[admin_id]
-    
-    if not database:
-        await callback.answer("❌ База данных не инициализирована", show_alert=True)
-        return
-    
-    # Parse user_id from callback data
-    try:
-        user_id = int(callback.data.split(":", 2)[2])
-    except (IndexError, ValueError):
-        await callback.answer("❌ Неверный ID пользователя", show_alert=True)
-        return
-    
-    # Get user from database
-    user = await database.get_user(user_id)
+async def _render_user_card(
+    user_id: int,
+    admin_role: AdminRole,
+    title: str = "Карточка пользователя",
+    include_nav: bool = True,
+):
+    """
+    Build the user-card text and role-gated action keyboard for one user.
+
+    Shared by the view handler and the post-reassign rebuild so the card is
+    formatted in exactly one place. Returns (None, None) if the user does
+    not exist.
+    """
+    user, vehicle_binding, daily_usage = await _load_user_card(user_id)
     if not user:
-        await callback.answer("❌ Пользователь не найден", show_alert=True)
-        return
-    
-    # Get additional data
-    vehicle_binding = await database.get_vehicle_binding(user_id)
-    daily_usage = await database.get_daily_usage(user_id)
-    
-    # Build user card
-    from datetime import datetime
-    
-    username = user.get('username') or 'N/A'
+        return None, None
+
+    username = user.get('username') or _N_A_ESC
     first_name = user.get('first_name') or ''
     last_name = user.get('last_name') or ''
     full_name = f"{first_name} {last_name}".strip() or username
-    
-    # Parse dates
-    created_at = datetime.fromisoformat(user['created_at']).strftime("%d.%m.%Y")
-    
+
+    # Parse dates, emitting the escaped form directly instead of running
+    # the generic escape pass over strings whose only special char is the dot
+    created_at = _iso_to_ddmmyyyy(user['created_at'])
+
     premium_status = "⭐ Активна" if user['is_premium'] else "❌ Нет"
     if user['is_premium'] and user['premium_expires_at']:
-        expires_at = datetime.fromisoformat(user['premium_expires_at']).strftime("%d.%m.%Y %H:%M")
-        premium_status = f"⭐ До {escape_markdown(expires_at)}"
-    
+        premium_status = f"⭐ До {_fmt_datetime(datetime.fromisoformat(user['premium_expires_at']))}"
+
     block_status = "🚫 Заблокирован" if user['is_blocked'] else "✅ Активен"
-    
+
     binding_info = "❌ Нет"
     if vehicle_binding:
         plate = vehicle_binding['plate_number']
-        binding_expires = datetime.fromisoformat(vehicle_binding['subscription_expires_at']).strftime("%d.%m.%Y")
-        binding_info = f"🚗 {escape_markdown(plate)} \\(до {escape_markdown(binding_expires)}\\)"
-    
+        binding_expires = _iso_to_ddmmyyyy(vehicle_binding['subscription_expires_at'])
+        binding_info = f"🚗 {_esc(plate)} \\(до {binding_expires}\\)"
+
     card_text = (
-        f"👤 *Карточка пользователя*\n\n"
+        f"👤 *{title}*\n\n"
         f"🆔 *ID:* `{user_id}`\n"
-        f"👤 *Имя:* {escape_markdown(full_name)}\n"
-        f"📱 *Username:* @{escape_markdown(username) if username != 'N/A' else 'N/A'}\n"
-        f"📅 *Регистрация:* {escape_markdown(created_at)}\n\n"
+        f"👤 *Имя:* {_esc(full_name)}\n"
+        f"📱 *Username:* @{_esc(username) if username != _N_A_ESC else _N_A_ESC}\n"
+        f"📅 *Регистрация:* {created_at}\n\n"
         f"⭐ *Premium:* {premium_status}\n"
         f"🔒 *Статус:* {block_status}\n"
         f"🚗 *Привязка ТС:* {binding_info}\n"
-        f"📊 *Запросов сегодня:* {escape_markdown(str(daily_usage))}\n"
+        f"📊 *Запросов сегодня:* {daily_usage}\n"
     )
-    
-    # Build action buttons based on role
-    admin_role = get_user_role(callback.from_user.id)
+
     builder = InlineKeyboardBuilder()
-    
+
     # Premium management (CO and ADMIN only)
     if admin_role >= AdminRole.CO:
         if user['is_premium']:
             builder.button(text="❌ Отозвать Premium", callback_data=f"admin_clients:revoke_premium:{user_id}")
         else:
             builder.button(text="⭐ Выдать Premium", callback_data=f"admin_clients:grant_premium:{user_id}")
-    
+
     # Block/Unblock (CO and ADMIN only)
     if admin_role >= AdminRole.CO:
         if user['is_blocked']:
             builder.button(text="✅ Разблокировать", callback_data=f"admin_clients:unblock:{user_id}")
         else:
             builder.button(text="🚫 Заблокировать", callback_data=f"admin_clients:block:{user_id}")
-    
+
     builder.adjust(2)
-    
+
     # Vehicle binding management (All admin roles)
     builder.row()
     if vehicle_binding:
         builder.button(text="🗑 Удалить привязку", callback_data=f"admin_clients:remove_binding:{user_id}")
     builder.button(text="🔄 Изменить привязку", callback_data=f"admin_clients:reassign_binding:{user_id}")
-    
+
     # Reset daily limit (All admin roles)
     builder.row()
     builder.button(text="♻️ СНЯТЬ ЛИМИТ", callback_data=f"admin_clients:reset_limit:{user_id}")
-    
+
     # Navigation
-    builder.row()
-    builder.button(text="◀️ К списку", callback_data="admin_clients:list:0")
-    builder.button(text="🏠 Главное меню", callback_data="admin_back_to_menu")
+    if include_nav:
+        builder.row()
+        builder.button(text="◀️ К списку", callback_data="admin_clients:list:0")
+        builder.button(text="🏠 Главное меню", callback_data="admin_back_to_menu")
+
+    return card_text, builder.as_markup()
+
+
+@require_role(AdminRole.RND)
+async def handle_view_client(callback: CallbackQuery):
+    """Show detailed user card with action buttons"""
+    # Clear any pending state when viewing a user
+    admin_id = callback.from_user.id
+    _state_pop(admin_id)
+    
+    if not database:
+        await callback.answer("❌ База данных не инициализирована", show_alert=True)
+        return
+    
+    # Parse user_id from callback data
+    _, user_id, _ = _client_cb_args(callback.data)
+    if user_id is None:
+        await callback.answer("❌ Неверный ID пользователя", show_alert=True)
+        return
+    
+    card_text, card_markup = await _render_user_card(
+        user_id, _get_user_role_cached(callback.from_user.id)
+    )
+    if card_text is None:
+        await callback.answer("❌ Пользователь не найден", show_alert=True)
+        return
     
     await safe_edit_message(
         callback,
         card_text,
-        reply_markup=builder.as_markup(),
+        reply_markup=card_markup,
         parse_mode=ParseMode.MARKDOWN_V2
     )
     
     await callback.answer()
 
 
-@admin_router.callback_query(F.data.startswith("admin_clients:grant_premium:"))
+# Plate validation: normalize Cyrillic look-alikes to their Latin twins so
+# the DB unique-key comparisons behave consistently, then gate on a strict
+# alphanumeric pattern before paying any DB round-trip
+_PLATE_TRANSLATE = str.maketrans("АВЕКМНОРСТУХ", "ABEKMHOPCTYX")
+_PLATE_RE = re.compile(r"^[A-ZА-Я0-9]{6,15}$")
+
+_GRANT_PREMIUM_PROMPT = (
+    "⭐ *Выдача Intellex Premium*\n\n"
+    "Выберите срок действия подписки:"
+)
+_PREMIUM_DURATIONS = (7, 30, 90, 365)
+
+
+@lru_cache(maxsize=256)
+def _premium_duration_markup(user_id: int) -> InlineKeyboardMarkup:
+    """Duration-selection keyboard for granting premium; only user_id varies."""
+    duration_row = [
+        InlineKeyboardButton(
+            text=f"{days} дней",
+            callback_data=f"admin_clients:grant_premium_confirm:{user_id}:{days}"
+        )
+        for days in _PREMIUM_DURATIONS
+    ]
+    return InlineKeyboardMarkup(inline_keyboard=[
+        duration_row[:2],
+        duration_row[2:],
+        [InlineKeyboardButton(text="❌ Отмена", callback_data=f"admin_clients:view:{user_id}")],
+    ])
+
+
 @require_role(AdminRole.CO)
 async def handle_grant_premium_prompt(callback: CallbackQuery):
     """Show duration selection for granting premium"""
-    try:
-        user_id = int(callback.data.split(":", 2)[2])
-    except (IndexError, ValueError):
+    _, user_id, _ = _client_cb_args(callback.data)
+    if user_id is None:
         await callback.answer("❌ Неверный ID пользователя", show_alert=True)
         return
     
-    prompt_text = (
-        "⭐ *Выдача Intellex Premium*\n\n"
-        "Выберите срок действия подписки:"
-    )
-    
-    builder = InlineKeyboardBuilder()
-    builder.button(text="7 дней", callback_data=f"admin_clients:grant_premium_confirm:{user_id}:7")
-    builder.button(text="30 дней", callback_data=f"admin_clients:grant_premium_confirm:{user_id}:30")
-    builder.row()
-    builder.button(text="90 дней", callback_data=f"admin_clients:grant_premium_confirm:{user_id}:90")
-    builder.button(text="365 дней", callback_data=f"admin_clients:grant_premium_confirm:{user_id}:365")
-    builder.row()
-    builder.button(text="❌ Отмена", callback_data=f"admin_clients:view:{user_id}")
-    
-    await safe_edit_message(
-        callback,
-        prompt_text,
-        reply_markup=builder.as_markup(),
-        parse_mode=ParseMode.MARKDOWN_V2
+    await safe_edit_message(
+        callback,
+        _GRANT_PREMIUM_PROMPT,
+        reply_markup=_premium_duration_markup(user_id),
+        parse_mode=ParseMode.MARKDOWN_V2
     )
     
     await callback.answer()
 
 
-@admin_router.callback_query(F.data.startswith("admin_clients:grant_premium_confirm:"))
 @require_role(AdminRole.CO)
 async def handle_grant_premium_confirm(callback: CallbackQuery):
     """Grant premium to user with selected duration"""
@@ -987,65 +1449,49 @@ async def handle_grant_premium_confirm(callback: CallbackQuery):
         await callback.answer("❌ База данных не инициализирована", show_alert=True)
         return
     
-    try:
-        parts = callback.data.split(":")
-        user_id = int(parts[2])
-        days = int(parts[3])
-    except (IndexError, ValueError):
+    _, user_id, days = _client_cb_args(callback.data)
+    if user_id is None or days is None:
         await callback.answer("❌ Неверные параметры", show_alert=True)
         return
     
     # Calculate expiry date
-    from datetime import datetime, timedelta
     expires_at = datetime.now() + timedelta(days=days)
     
     # Update user premium status
     try:
         await database.update_user_premium(user_id, is_premium=True, expires_at=expires_at)
+        _invalidate_user_card(user_id)
         
-        # Log action
-        if bot_instance:
-            admin_id = callback.from_user.id
-            admin_name = f"{callback.from_user.first_name or ''} {callback.from_user.last_name or ''}".strip()
-            if not admin_name:
-                admin_name = callback.from_user.username or "Unknown"
-            
-            await log_admin_action(
-                bot=bot_instance,
-                admin_id=admin_id,
-                admin_name=admin_name,
-                action="Grant Premium",
-                details=f"Duration: {days} days, Expires: {expires_at.strftime('%d.%m.%Y %H:%M')}",
-                target_user_id=user_id
-            )
-        
-        # Log to database
-        await database.log_admin_action(
-            admin_user_id=callback.from_user.id,
-            action_type="grant_premium",
+        # Log to the group and the DB audit table concurrently
+        await _log_admin_action_both(
+            callback.from_user,
+            action="Grant Premium",
+            details=f"Duration: {days} days, Expires: {expires_at.strftime('%d.%m.%Y %H:%M')}",
             target_user_id=user_id,
+            action_type="grant_premium",
             action_details={"days": days, "expires_at": expires_at.isoformat()}
         )
         
         await callback.answer(f"✅ Premium выдан на {days} дней", show_alert=True)
         
-        # Return to user card - create new callback data instead of modifying frozen object
-        from aiogram.types import CallbackQuery as CQ
-        new_callback = CQ(
-            id=callback.id,
-            from_user=callback.from_user,
-            message=callback.message,
-            chat_instance=callback.chat_instance,
-            data=f"admin_clients:view:{user_id}"
+        # Refresh the user card in place — rendering directly skips the
+        # reconstructed CallbackQuery, the role decorator and the re-parse
+        card_text, card_markup = await _render_user_card(
+            user_id, _get_user_role_cached(callback.from_user.id)
         )
-        await handle_view_client(new_callback)
+        if card_text is not None:
+            await safe_edit_message(
+                callback,
+                card_text,
+                reply_markup=card_markup,
+                parse_mode=ParseMode.MARKDOWN_V2
+            )
         
     except Exception as e:
         logger.error(f"Error granting premium: {e}")
         await callback.answer("❌ Ошибка при выдаче Premium", show_alert=True)
 
 
-@admin_router.callback_query(F.data.startswith("admin_clients:revoke_premium:"))
 @require_role(AdminRole.CO)
 async def handle_revoke_premium(callback: CallbackQuery):
     """Revoke premium from user"""
@@ -1053,60 +1499,49 @@ async def handle_revoke_premium(callback: CallbackQuery):
         await callback.answer("❌ База данных не инициализирована", show_alert=True)
         return
     
-    try:
-        user_id = int(callback.data.split(":", 2)[2])
-    except (IndexError, ValueError):
+    _, user_id, _ = _client_cb_args(callback.data)
+    if user_id is None:
         await callback.answer("❌ Неверный ID пользователя", show_alert=True)
         return
     
     # Update user premium status
     try:
-        from datetime import datetime
+        # One clock read shared by both log timestamps, so the human-readable
+        # and the audit value can never disagree
+        now = datetime.now()
         await database.update_user_premium(user_id, is_premium=False, expires_at=None)
+        _invalidate_user_card(user_id)
         
-        # Log action
-        if bot_instance:
-            admin_id = callback.from_user.id
-            admin_name = f"{callback.from_user.first_name or ''} {callback.from_user.last_name or ''}".strip()
-            if not admin_name:
-                admin_name = callback.from_user.username or "Unknown"
-            
-            await log_admin_action(
-                bot=bot_instance,
-                admin_id=admin_id,
-                admin_name=admin_name,
-                action="Revoke Premium",
-                details=f"Revoked at: {datetime.now().strftime('%d.%m.%Y %H:%M')}",
-                target_user_id=user_id
-            )
-        
-        # Log to database
-        await database.log_admin_action(
-            admin_user_id=callback.from_user.id,
-            action_type="revoke_premium",
+        # Log to the group and the DB audit table concurrently
+        await _log_admin_action_both(
+            callback.from_user,
+            action="Revoke Premium",
+            details=f"Revoked at: {now.strftime('%d.%m.%Y %H:%M')}",
             target_user_id=user_id,
-            action_details={"revoked_at": datetime.now().isoformat()}
+            action_type="revoke_premium",
+            action_details={"revoked_at": now.isoformat()}
         )
         
         await callback.answer("✅ Premium отозван", show_alert=True)
         
-        # Return to user card - create new callback data instead of modifying frozen object
-        from aiogram.types import CallbackQuery as CQ
-        new_callback = CQ(
-            id=callback.id,
-            from_user=callback.from_user,
-            message=callback.message,
-            chat_instance=callback.chat_instance,
-            data=f"admin_clients:view:{user_id}"
+        # Refresh the user card in place — rendering directly skips the
+        # reconstructed CallbackQuery, the role decorator and the re-parse
+        card_text, card_markup = await _render_user_card(
+            user_id, _get_user_role_cached(callback.from_user.id)
         )
-        await handle_view_client(new_callback)
+        if card_text is not None:
+            await safe_edit_message(
+                callback,
+                card_text,
+                reply_markup=card_markup,
+                parse_mode=ParseMode.MARKDOWN_V2
+            )
         
     except Exception as e:
         logger.error(f"Error revoking premium: {e}")
         await callback.answer("❌ Ошибка при отзыве Premium", show_alert=True)
 
 
-@admin_router.callback_query(F.data.startswith("admin_clients:block:"))
 @require_role(AdminRole.CO)
 async def handle_block_user(callback: CallbackQuery):
     """Block a user"""
@@ -1114,58 +1549,45 @@ async def handle_block_user(callback: CallbackQuery):
         await callback.answer("❌ База данных не инициализирована", show_alert=True)
         return
     
-    try:
-        user_id = int(callback.data.split(":", 2)[2])
-    except (IndexError, ValueError):
+    _, user_id, _ = _client_cb_args(callback.data)
+    if user_id is None:
         await callback.answer("❌ Неверный ID пользователя", show_alert=True)
         return
     
     try:
         await database.block_user(user_id)
+        _invalidate_user_card(user_id)
         
-        # Log action
-        if bot_instance:
-            admin_id = callback.from_user.id
-            admin_name = f"{callback.from_user.first_name or ''} {callback.from_user.last_name or ''}".strip()
-            if not admin_name:
-                admin_name = callback.from_user.username or "Unknown"
-            
-            await log_admin_action(
-                bot=bot_instance,
-                admin_id=admin_id,
-                admin_name=admin_name,
-                action="Block User",
-                details="User access blocked",
-                target_user_id=user_id
-            )
-        
-        # Log to database
-        await database.log_admin_action(
-            admin_user_id=callback.from_user.id,
-            action_type="block_user",
+        # Log to the group and the DB audit table concurrently
+        await _log_admin_action_both(
+            callback.from_user,
+            action="Block User",
+            details="User access blocked",
             target_user_id=user_id,
+            action_type="block_user",
             action_details={"blocked": True}
         )
         
         await callback.answer("✅ Пользователь заблокирован", show_alert=True)
         
-        # Return to user card - create new callback data instead of modifying frozen object
-        from aiogram.types import CallbackQuery as CQ
-        new_callback = CQ(
-            id=callback.id,
-            from_user=callback.from_user,
-            message=callback.message,
-            chat_instance=callback.chat_instance,
-            data=f"admin_clients:view:{user_id}"
+        # Refresh the user card in place — rendering directly skips the
+        # reconstructed CallbackQuery, the role decorator and the re-parse
+        card_text, card_markup = await _render_user_card(
+            user_id, _get_user_role_cached(callback.from_user.id)
         )
-        await handle_view_client(new_callback)
+        if card_text is not None:
+            await safe_edit_message(
+                callback,
+                card_text,
+                reply_markup=card_markup,
+                parse_mode=ParseMode.MARKDOWN_V2
+            )
         
     except Exception as e:
         logger.error(f"Error blocking user: {e}")
         await callback.answer("❌ Ошибка при блокировке", show_alert=True)
 
 
-@admin_router.callback_query(F.data.startswith("admin_clients:unblock:"))
 @require_role(AdminRole.CO)
 async def handle_unblock_user(callback: CallbackQuery):
     """Unblock a user"""
@@ -1173,58 +1595,45 @@ async def handle_unblock_user(callback: CallbackQuery):
         await callback.answer("❌ База данных не инициализирована", show_alert=True)
         return
     
-    try:
-        user_id = int(callback.data.split(":", 2)[2])
-    except (IndexError, ValueError):
+    _, user_id, _ = _client_cb_args(callback.data)
+    if user_id is None:
         await callback.answer("❌ Неверный ID пользователя", show_alert=True)
         return
     
     try:
         await database.unblock_user(user_id)
+        _invalidate_user_card(user_id)
         
-        # Log action
-        if bot_instance:
-            admin_id = callback.from_user.id
-            admin_name = f"{callback.from_user.first_name or ''} {callback.from_user.last_name or ''}".strip()
-            if not admin_name:
-                admin_name = callback.from_user.username or "Unknown"
-            
-            await log_admin_action(
-                bot=bot_instance,
-                admin_id=admin_id,
-                admin_name=admin_name,
-                action="Unblock User",
-                details="User access restored",
-                target_user_id=user_id
-            )
-        
-        # Log to database
-        await database.log_admin_action(
-            admin_user_id=callback.from_user.id,
-            action_type="unblock_user",
+        # Log to the group and the DB audit table concurrently
+        await _log_admin_action_both(
+            callback.from_user,
+            action="Unblock User",
+            details="User access restored",
             target_user_id=user_id,
+            action_type="unblock_user",
             action_details={"blocked": False}
         )
         
         await callback.answer("✅ Пользователь разблокирован", show_alert=True)
         
-        # Return to user card - create new callback data instead of modifying frozen object
-        from aiogram.types import CallbackQuery as CQ
-        new_callback = CQ(
-            id=callback.id,
-            from_user=callback.from_user,
-            message=callback.message,
-            chat_instance=callback.chat_instance,
-            data=f"admin_clients:view:{user_id}"
+        # Refresh the user card in place — rendering directly skips the
+        # reconstructed CallbackQuery, the role decorator and the re-parse
+        card_text, card_markup = await _render_user_card(
+            user_id, _get_user_role_cached(callback.from_user.id)
         )
-        await handle_view_client(new_callback)
+        if card_text is not None:
+            await safe_edit_message(
+                callback,
+                card_text,
+                reply_markup=card_markup,
+                parse_mode=ParseMode.MARKDOWN_V2
+            )
         
     except Exception as e:
         logger.error(f"Error unblocking user: {e}")
         await callback.answer("❌ Ошибка при разблокировке", show_alert=True)
 
 
-@admin_router.callback_query(F.data.startswith("admin_clients:reset_limit:"))
 @require_role(AdminRole.RND)
 async def handle_reset_daily_limit(callback: CallbackQuery):
     """Reset daily usage limit for a user"""
@@ -1232,59 +1641,46 @@ async def handle_reset_daily_limit(callback: CallbackQuery):
         await callback.answer("❌ База данных не инициализирована", show_alert=True)
         return
     
-    try:
-        user_id = int(callback.data.split(":", 2)[2])
-    except (IndexError, ValueError):
+    _, user_id, _ = _client_cb_args(callback.data)
+    if user_id is None:
         await callback.answer("❌ Неверный ID пользователя", show_alert=True)
         return
     
     try:
         old_usage = await database.get_daily_usage(user_id)
         await database.reset_daily_usage(user_id)
+        _invalidate_user_card(user_id)
         
-        # Log action
-        if bot_instance:
-            admin_id = callback.from_user.id
-            admin_name = f"{callback.from_user.first_name or ''} {callback.from_user.last_name or ''}".strip()
-            if not admin_name:
-                admin_name = callback.from_user.username or "Unknown"
-            
-            await log_admin_action(
-                bot=bot_instance,
-                admin_id=admin_id,
-                admin_name=admin_name,
-                action="Reset Daily Limit",
-                details=f"Reset usage from {old_usage} to 0",
-                target_user_id=user_id
-            )
-        
-        # Log to database
-        await database.log_admin_action(
-            admin_user_id=callback.from_user.id,
-            action_type="reset_daily_limit",
+        # Log to the group and the DB audit table concurrently
+        await _log_admin_action_both(
+            callback.from_user,
+            action="Reset Daily Limit",
+            details=f"Reset usage from {old_usage} to 0",
             target_user_id=user_id,
+            action_type="reset_daily_limit",
             action_details={"old_usage": old_usage, "new_usage": 0}
         )
         
         await callback.answer(f"✅ Дневной лимит сброшен (было: {old_usage})", show_alert=True)
         
-        # Return to user card - create new callback data instead of modifying frozen object
-        from aiogram.types import CallbackQuery as CQ
-        new_callback = CQ(
-            id=callback.id,
-            from_user=callback.from_user,
-            message=callback.message,
-            chat_instance=callback.chat_instance,
-            data=f"admin_clients:view:{user_id}"
+        # Refresh the user card in place — rendering directly skips the
+        # reconstructed CallbackQuery, the role decorator and the re-parse
+        card_text, card_markup = await _render_user_card(
+            user_id, _get_user_role_cached(callback.from_user.id)
         )
-        await handle_view_client(new_callback)
+        if card_text is not None:
+            await safe_edit_message(
+                callback,
+                card_text,
+                reply_markup=card_markup,
+                parse_mode=ParseMode.MARKDOWN_V2
+            )
         
     except Exception as e:
         logger.error(f"Error resetting daily limit: {e}")
         await callback.answer("❌ Ошибка при сбросе лимита", show_alert=True)
 
 
-@admin_router.callback_query(F.data.startswith("admin_clients:remove_binding:"))
 @require_role(AdminRole.RND)
 async def handle_remove_binding(callback: CallbackQuery):
     """Remove vehicle binding from user"""
@@ -1292,77 +1688,62 @@ async def handle_remove_binding(callback: CallbackQuery):
         await callback.answer("❌ База данных не инициализирована", show_alert=True)
         return
     
-    try:
-        user_id = int(callback.data.split(":", 2)[2])
-    except (IndexError, ValueError):
+    _, user_id, _ = _client_cb_args(callback.data)
+    if user_id is None:
         await callback.answer("❌ Неверный ID пользователя", show_alert=True)
         return
     
     try:
-        # Get current binding for logging
-        binding = await database.get_vehicle_binding(user_id)
-        plate = binding['plate_number'] if binding else "Unknown"
-        
-        await database.remove_vehicle_binding(user_id)
-        
-        # Log action
-        if bot_instance:
-            admin_id = callback.from_user.id
-            admin_name = f"{callback.from_user.first_name or ''} {callback.from_user.last_name or ''}".strip()
-            if not admin_name:
-                admin_name = callback.from_user.username or "Unknown"
-            
-            await log_admin_action(
-                bot=bot_instance,
-                admin_id=admin_id,
-                admin_name=admin_name,
-                action="Remove Vehicle Binding",
-                details=f"Removed plate: {plate}",
-                target_user_id=user_id
-            )
-        
-        # Log to database
-        await database.log_admin_action(
-            admin_user_id=callback.from_user.id,
-            action_type="remove_binding",
+        # Remove and fetch the old plate for logging in one transaction
+        plate = await database.remove_vehicle_binding_returning_plate(user_id)
+        if plate is None:
+            plate = "Unknown"
+        _invalidate_user_card(user_id)
+        
+        # Log to the group and the DB audit table concurrently
+        await _log_admin_action_both(
+            callback.from_user,
+            action="Remove Vehicle Binding",
+            details=f"Removed plate: {plate}",
             target_user_id=user_id,
+            action_type="remove_binding",
             action_details={"plate": plate}
         )
         
         await callback.answer("✅ Привязка удалена", show_alert=True)
         
-        # Return to user card - create new callback data instead of modifying frozen object
-        from aiogram.types import CallbackQuery as CQ
-        new_callback = CQ(
-            id=callback.id,
-            from_user=callback.from_user,
-            message=callback.message,
-            chat_instance=callback.chat_instance,
-            data=f"admin_clients:view:{user_id}"
+        # Refresh the user card in place — rendering directly skips the
+        # reconstructed CallbackQuery, the role decorator and the re-parse
+        card_text, card_markup = await _render_user_card(
+            user_id, _get_user_role_cached(callback.from_user.id)
         )
-        await handle_view_client(new_callback)
+        if card_text is not None:
+            await safe_edit_message(
+                callback,
+                card_text,
+                reply_markup=card_markup,
+                parse_mode=ParseMode.MARKDOWN_V2
+            )
         
     except Exception as e:
         logger.error(f"Error removing binding: {e}")
         await callback.answer("❌ Ошибка при удалении привязки", show_alert=True)
 
 
-@admin_router.callback_query(F.data.startswith("admin_clients:reassign_binding:"))
 @require_role(AdminRole.RND)
 async def handle_reassign_binding_prompt(callback: CallbackQuery):
     """Prompt for new plate number to reassign binding"""
-    try:
-        target_user_id = int(callback.data.split(":", 2)[2])
-    except (IndexError, ValueError):
+    _, target_user_id, _ = _client_cb_args(callback.data)
+    if target_user_id is None:
         await callback.answer("❌ Неверный ID пользователя", show_alert=True)
         return
     
     # Store state for this admin
     admin_id = callback.from_user.id
-    _admin_state_store[admin_id] = {
+    _state_set(admin_id, {
         "action": "reassign_binding",
         "target_user_id": target_user_id
-    }
+    })
     
     prompt_text = (
         "🔄 *Изменение привязки ТС*\n\n"
@@ -1389,46 +1770,58 @@ async def handle_reassign_binding_prompt(callback: CallbackQuery):
 async def cmd_admin_cancel(message: Message):
     """Cancel any pending admin action"""
     admin_id = message.from_user.id
-    if admin_id in _admin_state_store:
-        del _admin_state_store[admin_id]
+    if _state_pop(admin_id) is not None:
         await message.answer("✅ Действие отменено")
     else:
         await message.answer("ℹ️ Нет активных действий для отмены")
 
 
-@admin_router.message(F.text)
+class PendingAdminAction(Filter):
+    """
+    Matches only messages from admins with a pending multi-step action.
+
+    Gating at the filter level means the dispatcher skips
+    handle_admin_text_input entirely for ordinary text traffic instead of
+    entering the handler just to return.
+    """
+
+    async def __call__(self, message: Message) -> bool:
+        return message.from_user.id in _admin_state_store
+
+
+@admin_router.message(F.text, PendingAdminAction())
 async def handle_admin_text_input(message: Message):
     """Handle text input for admin actions that require it"""
     admin_id = message.from_user.id
     
-    # Check if admin has pending action
-    if admin_id not in _admin_state_store:
-        return  # Not an admin action, let other handlers process it
-    
-    state = _admin_state_store[admin_id]
+    # Re-check through _state_get: the entry may have expired between the
+    # filter's membership probe and now
+    state = _state_get(admin_id)
+    if state is None:
+        return
     action = state.get("action")
     
     if action == "reassign_binding":
         # Verify admin still has required role
-        user_role = get_user_role(admin_id)
+        user_role = _get_user_role_cached(admin_id)
         if user_role < AdminRole.RND:
-            del _admin_state_store[admin_id]
+            _state_pop(admin_id)
             await message.answer("⛔ Недостаточно прав доступа")
             return
         
         if not database:
-            del _admin_state_store[admin_id]
+            _state_pop(admin_id)
             await message.answer("❌ База данных не инициализирована")
             return
         
         target_user_id = state.get("target_user_id")
-        new_plate = message.text.strip().upper()
+        new_plate = message.text.strip().upper().translate(_PLATE_TRANSLATE)
         
-        # Basic validation
-        if len(new_plate) < 6 or len(new_plate) > 15:
+        # Reject malformed input before it reaches the DB
+        if not _PLATE_RE.match(new_plate):
             await message.answer(
                 "❌ *Неверный формат номера*\n\n"
-                "Номер должен содержать от 6 до 15 символов\\.\n\n"
+                "Номер должен содержать от 6 до 15 букв и цифр\\.\n\n"
                 "Попробуйте еще раз или используйте `/admin_cancel`",
                 parse_mode=ParseMode.MARKDOWN_V2
             )
@@ -1436,40 +1829,27 @@ async def handle_admin_text_input(message: Message):
         
         try:
             # Set binding with 365 days expiry (can be adjusted)
-            from datetime import datetime, timedelta
             expires_at = datetime.now() + timedelta(days=365)
             
-            # Get old binding for logging
-            old_binding = await database.get_vehicle_binding(target_user_id)
-            old_plate = old_binding['plate_number'] if old_binding else "None"
+            # Replace the binding and fetch the old plate for logging in
+            # one transaction
+            old_plate = await database.replace_vehicle_binding(target_user_id, new_plate, expires_at)
+            if old_plate is None:
+                old_plate = "None"
+            _invalidate_user_card(target_user_id)
             
-            await database.set_vehicle_binding(target_user_id, new_plate, expires_at)
-            
-            # Log action
-            if bot_instance:
-                admin_name = f"{message.from_user.first_name or ''} {message.from_user.last_name or ''}".strip()
-                if not admin_name:
-                    admin_name = message.from_user.username or "Unknown"
-                
-                await log_admin_action(
-                    bot=bot_instance,
-                    admin_id=admin_id,
-                    admin_name=admin_name,
-                    action="Reassign Vehicle Binding",
-                    details=f"Old: {old_plate} → New: {new_plate}, Expires: {expires_at.strftime('%d.%m.%Y')}",
-                    target_user_id=target_user_id
-                )
-            
-            # Log to database
-            await database.log_admin_action(
-                admin_user_id=admin_id,
-                action_type="reassign_binding",
+            # Log to the group and the DB audit table concurrently
+            await _log_admin_action_both(
+                message.from_user,
+                action="Reassign Vehicle Binding",
+                details=f"Old: {old_plate} → New: {new_plate}, Expires: {expires_at.strftime('%d.%m.%Y')}",
                 target_user_id=target_user_id,
+                action_type="reassign_binding",
                 action_details={"old_plate": old_plate, "new_plate": new_plate, "expires_at": expires_at.isoformat()}
             )
             
             # Clear state
-            del _admin_state_store[admin_id]
+            _state_pop(admin_id)
             
             # Show success with user card
             await message.answer(
@@ -1482,194 +1862,132 @@ async def handle_admin_text_input(message: Message):
             )
             
             # Build user card for quick access
-            user = await database.get_user(target_user_id)
-            if user:
-                vehicle_binding = await database.get_vehicle_binding(target_user_id)
-                daily_usage = await database.get_daily_usage(target_user_id)
-                
-                username = user.get('username') or 'N/A'
-                first_name = user.get('first_name') or ''
-                last_name = user.get('last_name') or ''
-                full_name = f"{first_name} {last_name}".strip() or username
-                
-                created_at = datetime.fromisoformat(user['created_at']).strftime("%d.%m.%Y")
-                
-                premium_status = "⭐ Активна" if user['is_premium'] else "❌ Нет"
-                if user['is_premium'] and user['premium_expires_at']:
-                    expires_at_premium = datetime.fromisoformat(user['premium_expires_at']).strftime("%d.%m.%Y %H:%M")
-                    premium_status = f"⭐ До {escape_markdown(expires_at_premium)}"
-                
-                block_status = "🚫 Заблокирован" if user['is_blocked'] else "✅ Активен"
-                
-                binding_info = "❌ Нет"
-                if vehicle_binding:
-                    plate = vehicle_binding['plate_number']
-                    binding_expires = datetime.fromisoformat(vehicle_binding['subscription_expires_at']).strftime("%d.%m.%Y")
-                    binding_info = f"🚗 {escape_markdown(plate)} \\(до {escape_markdown(binding_expires)}\\)"
-                
-                card_text = (
-                    f"👤 *Обновленная карточка пользователя*\n\n"
-                    f"🆔 *ID:* `{target_user_id}`\n"
-                    f"👤 *Имя:* {escape_markdown(full_name)}\n"
-                    f"📱 *Username:* @{escape_markdown(username) if username != 'N/A' else 'N/A'}\n"
-                    f"📅 *Регистрация:* {escape_markdown(created_at)}\n\n"
-                    f"⭐ *Premium:* {premium_status}\n"
-                    f"🔒 *Статус:* {block_status}\n"
-                    f"🚗 *Привязка ТС:* {binding_info}\n"
-                    f"📊 *Запросов сегодня:* {escape_markdown(str(daily_usage))}\n"
-                )
-                
-                builder = InlineKeyboardBuilder()
-                
-                # Premium management (CO and ADMIN only)
-                if user_role >= AdminRole.CO:
-                    if user['is_premium']:
-                        builder.button(text="❌ Отозвать Premium", callback_data=f"admin_clients:revoke_premium:{target_user_id}")
-                    else:
-                        builder.button(text="⭐ Выдать Premium", callback_data=f"admin_clients:grant_premium:{target_user_id}")
-                
-                # Block/Unblock (CO and ADMIN only)
-                if user_role >= AdminRole.CO:
-                    if user['is_blocked']:
-                        builder.button(text="✅ Разблокировать", callback_data=f"admin_clients:unblock:{target_user_id}")
-                    else:
-                        builder.button(text="🚫 Заблокировать", callback_data=f"admin_clients:block:{target_user_id}")
-                
-                builder.adjust(2)
-                
-                # Vehicle binding management (All admin roles)
-                builder.row()
-                if vehicle_binding:
-                    builder.button(text="🗑 Удалить привязку", callback_data=f"admin_clients:remove_binding:{target_user_id}")
-                builder.button(text="🔄 Изменить привязку", callback_data=f"admin_clients:reassign_binding:{target_user_id}")
-                
-                # Reset daily limit (All admin roles)
-                builder.row()
-                builder.button(text="♻️ СНЯТЬ ЛИМИТ", callback_data=f"admin_clients:reset_limit:{target_user_id}")
-                
+            card_text, card_markup = await _render_user_card(
+                target_user_id, user_role,
+                title="Обновленная карточка пользователя",
+                include_nav=False
+            )
+            if card_text is not None:
                 await message.answer(
                     card_text,
-                    reply_markup=builder.as_markup(),
+                    reply_markup=card_markup,
                     parse_mode=ParseMode.MARKDOWN_V2
                 )
             
         except Exception as e:
             logger.error(f"Error reassigning binding: {e}")
-            del _admin_state_store[admin_id]
+            _state_pop(admin_id)
             await message.answer("❌ Ошибка при изменении привязки")
 
 
-@admin_router.callback_query(F.data.startswith("admin_clients:reset_limit:"))
-@require_role(AdminRole.RND)
-async def handle_reset_limit(callback: CallbackQuery):
-    """Reset daily usage limit for user"""
-    if not database:
-        await callback.answer("❌ База данных не инициализирована", show_alert=True)
-        return
-    
-    try:
-        user_id = int(callback.data.split(":", 2)[2])
-    except (IndexError, ValueError):
-        await callback.answer("❌ Неверный ID пользователя", show_alert=True)
-        return
-    
-    try:
-        # Get current usage for logging
-        current_usage = await database.get_daily_usage(user_id)
-        
-        await database.reset_daily_usage(user_id)
-        
-        # Log action
-        if bot_instance:
-            admin_id = callback.from_user.id
-            admin_name = f"{callback.from_user.first_name or ''} {callback.from_user.last_name or ''}".strip()
-            if not admin_name:
-                admin_name = callback.from_user.username or "Unknown"
-            
-            await log_admin_action(
-                bot=bot_instance,
-                admin_id=admin_id,
-                admin_name=admin_name,
-                action="Reset Daily Limit",
-                details=f"Previous usage: {current_usage} requests",
-                target_user_id=user_id
-            )
-        
-        # Log to database
-        await database.log_admin_action(
-            admin_user_id=callback.from_user.id,
-            action_type="reset_limit",
-            target_user_id=user_id,
-            action_details={"previous_usage": current_usage}
-        )
-        
-        await callback.answer(f"✅ Лимит сброшен (было: {current_usage})", show_alert=True)
-        
-        # Return to user card
-        callback.data = f"admin_clients:view:{user_id}"
-        await handle_view_client(callback)
-        
-    except Exception as e:
-        logger.error(f"Error resetting limit: {e}")
-        await callback.answer("❌ Ошибка при сбросе лимита", show_alert=True)
-
-
-@admin_router.callback_query(F.data.startswith("admin_clients:"))
 @require_role(AdminRole.RND)
 async def handle_client_actions(callback: CallbackQuery):
     """Catch-all handler for other client actions"""
     await callback.answer("🚧 В разработке", show_alert=True)
 
 
+# Dispatch table for admin_clients:* callbacks, same scheme as the general
+# section: one router filter, one split, one dict lookup. Role checks stay
+# on the individual handlers.
+_CLIENT_HANDLERS = {
+    "list": handle_clients_list,
+    "search_prompt": handle_search_prompt,
+    "view": handle_view_client,
+    "grant_premium": handle_grant_premium_prompt,
+    "grant_premium_confirm": handle_grant_premium_confirm,
+    "revoke_premium": handle_revoke_premium,
+    "block": handle_block_user,
+    "unblock": handle_unblock_user,
+    "reset_limit": handle_reset_daily_limit,
+    "remove_binding": handle_remove_binding,
+    "reassign_binding": handle_reassign_binding_prompt,
+}
+
+
+@admin_router.callback_query(F.data.startswith("admin_clients:"))
+async def dispatch_client_action(callback: CallbackQuery):
+    """Route admin_clients:* callbacks through the dispatch table"""
+    action = callback.data.split(":", 2)[1]
+    handler = _CLIENT_HANDLERS.get(action, handle_client_actions)
+    await handler(callback)
+
+
 @admin_router.callback_query(F.data == "admin_section:payments")
 @require_role(AdminRole.CO)
 async def handle_payments_section(callback: CallbackQuery):
     """
     Handle Payments section - show payment system information
     """
-    # Build section text
-    section_text = (
-        "💰 *Платежные системы*\n\n"
-        "✅ Привязан DC/ExpressPay"
-    )
-    
-    # Build keyboard
-    builder = InlineKeyboardBuilder()
-    builder.button(text="◀️ Назад в меню", callback_data="admin_back_to_menu")
-    
     await safe_edit_message(
         callback,
-        section_text,
-        reply_markup=builder.as_markup(),
+        _PAYMENTS_SECTION_TEXT,
+        reply_markup=_BACK_TO_MENU_MARKUP,
         parse_mode=ParseMode.MARKDOWN_V2
     )
     
     await callback.answer("Открыт раздел: Платежные системы")
 
 
-@admin_router.callback_query(F.data.startswith("payment:approve:"))
-@require_role(AdminRole.CO)
-async def handle_payment_approval(callback: CallbackQuery):
-    """Handle payment approval"""
+# Static MarkdownV2 bodies for the payment screens, escaped by hand once at
+# module level instead of being reassembled on every click
+_PAYMENTS_SECTION_TEXT = (
+    "💰 *Платежные системы*\n\n"
+    "✅ Привязан DC/ExpressPay"
+)
+
+_REJECTION_NOTIFICATION_TEXT = (
+    "❌ *Оплата не найдена*\n\n"
+    "К сожалению, мы не смогли подтвердить вашу оплату\\.\n\n"
+    "Пожалуйста, убедитесь, что:\n"
+    "• Платеж был успешно выполнен\n"
+    "• Указана правильная сумма\n\n"
+    "Если у вас есть вопросы, свяжитесь с поддержкой\\."
+)
+
+
+# Single validation pass for payment decision callbacks: action and id are
+# captured together, so malformed payloads are rejected before any DB work
+_PAYMENT_CB = re.compile(r"^payment:(approve|reject):(\d+)$")
+
+
+async def _load_pending_request(callback: CallbackQuery, request_id: int) -> Optional[dict]:
+    """Fetch a payment request if it exists and still awaits approval."""
     if not database:
         await callback.answer("❌ База данных не инициализирована", show_alert=True)
-        return
+        return None
     
-    try:
-        request_id = int(callback.data.split(":", 2)[2])
-    except (IndexError, ValueError):
-        await callback.answer("❌ Неверный ID заявки", show_alert=True)
-        return
-    
-    # Get payment request
     request = await database.get_payment_request(request_id)
     
     if not request:
         await callback.answer("❌ Заявка не найдена", show_alert=True)
-        return
+        return None
     
     if request['status'] != 'awaiting_approval':
         await callback.answer("⚠️ Заявка уже обработана", show_alert=True)
+        return None
+    
+    return request
+
+
+@admin_router.callback_query(F.data.startswith("payment:"))
+@require_role(AdminRole.CO)
+async def dispatch_payment_decision(callback: CallbackQuery):
+    """Validate payment:approve/reject callbacks and route to shared logic"""
+    match = _PAYMENT_CB.match(callback.data)
+    if match is None:
+        await callback.answer("❌ Неверный ID заявки", show_alert=True)
+        return
+    request_id = int(match.group(2))
+    if match.group(1) == "approve":
+        await handle_payment_approval(callback, request_id)
+    else:
+        await handle_payment_rejection(callback, request_id)
+
+
+async def handle_payment_approval(callback: CallbackQuery, request_id: int):
+    """Handle payment approval"""
+    request = await _load_pending_request(callback, request_id)
+    if request is None:
         return
     
     user_id = request['user_id']
@@ -1677,9 +1995,6 @@ async def handle_payment_approval(callback: CallbackQuery):
     
     if payment_type == 'subscription':
         # Process subscription payment
-        from datetime import datetime, timedelta
-        import subscription_service
-        
         metadata = request.get('payment_metadata') or {}
         plan_id = metadata.get('plan_id')
         
@@ -1689,89 +2004,53 @@ async def handle_payment_approval(callback: CallbackQuery):
         
         # Calculate new expiry date
         current_subscription = await database.get_active_subscription(user_id)
-        current_expiry = None
-        if current_subscription:
-            current_expiry = datetime.fromisoformat(current_subscription['expires_at'])
+        current_expiry = current_subscription['expires_at_dt'] if current_subscription else None
         
         new_expiry = subscription_service.calculate_new_expiry(current_expiry, plan_id)
         
-        # Create or update subscription
-        await database.create_subscription(
+        # Apply the whole approval write set (subscription, premium flags,
+        # request status, audit record) in one transaction
+        _invalidate_user_card(user_id)
+        await database.approve_subscription_atomic(
+            request_id=request_id,
             user_id=user_id,
-            subscription_type="premium",
-            starts_at=datetime.now(),
-            expires_at=new_expiry,
+            new_expiry=new_expiry,
             payment_amount=request['amount'],
-            payment_method="manual_approval"
-        )
-        
-        # Update user premium status
-        await database.update_user_premium(
-            user_id=user_id,
-            is_premium=True,
-            expires_at=new_expiry
-        )
-        
-        # Update payment request status
-        await database.update_payment_request_status(
-            request_id=request_id,
-            status="approved",
-            payment_method="manual_approval"
+            admin_user_id=callback.from_user.id,
+            action_details={
+                "request_id": request_id,
+                "plan_id": plan_id,
+                "amount": request['amount'],
+                "expires_at": new_expiry.isoformat()
+            }
         )
         
-        # Log action
-        admin_id = callback.from_user.id
-        admin_name = f"{callback.from_user.first_name or ''} {callback.from_user.last_name or ''}".strip()
-        if not admin_name:
-            admin_name = callback.from_user.username or "Unknown"
-        
+        # Log action to the group (queue-backed, returns immediately)
         if bot_instance:
             await log_admin_action(
                 bot=bot_instance,
-                admin_id=admin_id,
-                admin_name=admin_name,
+                admin_id=callback.from_user.id,
+                admin_name=_admin_display_name(callback.from_user),
                 action="Approve Subscription Payment",
                 details=f"Request #{request_id}, Plan: {metadata.get('plan_name', 'Unknown')}, Amount: {request['amount']} смн",
                 target_user_id=user_id
             )
         
-        await database.log_admin_action(
-            admin_user_id=admin_id,
-            action_type="approve_payment",
-            target_user_id=user_id,
-            action_details={
-                "request_id": request_id,
-                "plan_id": plan_id,
-                "amount": request['amount'],
-                "expires_at": new_expiry.isoformat()
-            }
+        # Notify the user and update the admin message concurrently
+        expiry_str = subscription_service.format_expiry_date(new_expiry)
+        notification_text = (
+            "✅ *Платеж обработан*\n\n"
+            "Ваша подписка Intellex Premium успешно активирована\\!\n\n"
+            f"💎 *План:* {escape_markdown(metadata.get('plan_name', 'Unknown'))}\n"
+            f"📅 *Действует до:* {escape_markdown(expiry_str)}\n\n"
+            "Спасибо за использование нашего сервиса\\!"
         )
-        
-        # Notify user
-        try:
-            expiry_str = subscription_service.format_expiry_date(new_expiry)
-            notification_text = (
-                "✅ *Платеж обработан*\n\n"
-                "Ваша подписка Intellex Premium успешно активирована\\!\n\n"
-                f"💎 *План:* {escape_markdown(metadata.get('plan_name', 'Unknown'))}\n"
-                f"📅 *Действует до:* {escape_markdown(expiry_str)}\n\n"
-                "Спасибо за использование нашего сервиса\\!"
-            )
-            
-            await bot_instance.send_message(
-                chat_id=user_id,
-                text=notification_text,
-                parse_mode=ParseMode.MARKDOWN_V2
-            )
-        except Exception as e:
-            logger.error(f"Error sending user notification: {e}")
-        
-        # Update callback message
-        await safe_edit_message(
+        await _notify_and_edit(
             callback,
+            user_id,
+            notification_text,
             f"✅ *Заявка \\#{request_id} одобрена*\n\n"
-            f"Пользователь `{user_id}` получил подписку\\.",
-            parse_mode=ParseMode.MARKDOWN_V2
+            f"Пользователь `{user_id}` получил подписку\\."
         )
         
         await callback.answer("✅ Платеж одобрен", show_alert=True)
@@ -1780,92 +2059,44 @@ async def handle_payment_approval(callback: CallbackQuery):
         await callback.answer("⚠️ Неизвестный тип платежа", show_alert=True)
 
 
-@admin_router.callback_query(F.data.startswith("payment:reject:"))
-@require_role(AdminRole.CO)
-async def handle_payment_rejection(callback: CallbackQuery):
+async def handle_payment_rejection(callback: CallbackQuery, request_id: int):
     """Handle payment rejection"""
-    if not database:
-        await callback.answer("❌ База данных не инициализирована", show_alert=True)
-        return
-    
-    try:
-        request_id = int(callback.data.split(":", 2)[2])
-    except (IndexError, ValueError):
-        await callback.answer("❌ Неверный ID заявки", show_alert=True)
-        return
-    
-    # Get payment request
-    request = await database.get_payment_request(request_id)
-    
-    if not request:
-        await callback.answer("❌ Заявка не найдена", show_alert=True)
-        return
-    
-    if request['status'] != 'awaiting_approval':
-        await callback.answer("⚠️ Заявка уже обработана", show_alert=True)
+    request = await _load_pending_request(callback, request_id)
+    if request is None:
         return
     
     user_id = request['user_id']
     
-    # Update payment request status
-    await database.update_payment_request_status(
+    # Apply the rejection write set (request status + audit record) in one
+    # transaction
+    await database.reject_payment_atomic(
         request_id=request_id,
-        status="rejected"
+        user_id=user_id,
+        admin_user_id=callback.from_user.id,
+        action_details={
+            "request_id": request_id,
+            "amount": request['amount']
+        }
     )
     
-    # Log action
-    admin_id = callback.from_user.id
-    admin_name = f"{callback.from_user.first_name or ''} {callback.from_user.last_name or ''}".strip()
-    if not admin_name:
-        admin_name = callback.from_user.username or "Unknown"
-    
-    metadata = request.get('payment_metadata') or {}
-    
+    # Log action to the group (queue-backed, returns immediately)
     if bot_instance:
         await log_admin_action(
             bot=bot_instance,
-            admin_id=admin_id,
-            admin_name=admin_name,
+            admin_id=callback.from_user.id,
+            admin_name=_admin_display_name(callback.from_user),
             action="Reject Subscription Payment",
             details=f"Request #{request_id}, Amount: {request['amount']} смн",
             target_user_id=user_id
         )
     
-    await database.log_admin_action(
-        admin_user_id=admin_id,
-        action_type="reject_payment",
-        target_user_id=user_id,
-        action_details={
-            "request_id": request_id,
-            "amount": request['amount']
-        }
-    )
-    
-    # Notify user
-    try:
-        notification_text = (
-            "❌ *Оплата не найдена*\n\n"
-            "К сожалению, мы не смогли подтвердить вашу оплату\\.\n\n"
-            "Пожалуйста, убедитесь, что:\n"
-            "• Платеж был успешно выполнен\n"
-            "• Указана правильная сумма\n\n"
-            "Если у вас есть вопросы, свяжитесь с поддержкой\\."
-        )
-        
-        await bot_instance.send_message(
-            chat_id=user_id,
-            text=notification_text,
-            parse_mode=ParseMode.MARKDOWN_V2
-        )
-    except Exception as e:
-        logger.error(f"Error sending user notification: {e}")
-    
-    # Update callback message
-    await safe_edit_message(
+    # Notify the user and update the admin message concurrently
+    await _notify_and_edit(
         callback,
+        user_id,
+        _REJECTION_NOTIFICATION_TEXT,
         f"❌ *Заявка \\#{request_id} отклонена*\n\n"
-        f"Пользователь `{user_id}` уведомлен\\.",
-        parse_mode=ParseMode.MARKDOWN_V2
+        f"Пользователь `{user_id}` уведомлен\\."
     )
     
     await callback.answer("❌ Платеж отклонен", show_alert=True)
@@ -1898,7 +2129,7 @@ async def handle_admin_section(callback: CallbackQuery):
     section = callback.data.split(":", 1)[1]
     
     user_id = callback.from_user.id
-    user_role = get_user_role(user_id)
+    user_role = _get_user_role_cached(user_id)
     
     # Verify user has access to this section
     permissions = get_section_permissions()
@@ -1908,73 +2139,54 @@ async def handle_admin_section(callback: CallbackQuery):
         await callback.answer("⛔ Недостаточно прав доступа", show_alert=True)
         return
     
-    # Get section info
-    emoji = get_section_emoji(section)
-    name = get_section_name(section)
-    
-    # Build "under construction" message
-    construction_text = (
-        f"{emoji} *{escape_markdown(name)}*\n\n"
-        "🚧 *Раздел в разработке*\n\n"
-        "Данный функционал находится в процессе разработки "
-        "и будет доступен в ближайшее время\\.\n\n"
-        "_Следите за обновлениями\\!_"
-    )
-    
-    # Back button
-    builder = InlineKeyboardBuilder()
-    builder.button(text="◀️ Назад в меню", callback_data="admin_back_to_menu")
+    # Known sections are fully pre-rendered; only unexpected ones are built here
+    construction_text = _CONSTRUCTION_TEXTS.get(section)
+    if construction_text is None:
+        construction_text = (
+            f"{get_section_emoji(section)} *{escape_markdown(get_section_name(section))}*\n\n"
+            "🚧 *Раздел в разработке*\n\n"
+            "Данный функционал находится в процессе разработки "
+            "и будет доступен в ближайшее время\\.\n\n"
+            "_Следите за обновлениями\\!_"
+        )
     
     await safe_edit_message(
         callback,
         construction_text,
-        reply_markup=builder.as_markup(),
+        reply_markup=_BACK_TO_MENU_MARKUP,
         parse_mode=ParseMode.MARKDOWN_V2
     )
     
-    await callback.answer(f"Открыт раздел: {name}")
+    await callback.answer(f"Открыт раздел: {get_section_name(section)}")
 
 
 @admin_router.callback_query(F.data == "admin_back_to_menu")
 async def handle_back_to_menu(callback: CallbackQuery):
     """Navigate back to main admin menu"""
     user_id = callback.from_user.id
-    user_role = get_user_role(user_id)
+    user_role = _get_user_role_cached(user_id)
     
     # Check if user still has admin role
     if user_role == AdminRole.NONE:
         await callback.answer("⛔ Доступ запрещён", show_alert=True)
         return
     
-    # Get role name
-    role_names = {
-        AdminRole.ADMIN: "Администратор",
-        AdminRole.CO: "Со-Администратор",
-        AdminRole.RND: "R&D Администратор"
-    }
-    role_name = role_names.get(user_role, "Unknown")
-    
     # Get user info
     first_name = callback.from_user.first_name or ""
     last_name = callback.from_user.last_name or ""
     username = callback.from_user.username or "Unknown"
     full_name = f"{first_name} {last_name}".strip() or username
-    
-    welcome_text = (
-        "🔐 *Панель администратора*\n\n"
-        f"👤 *Администратор:* {escape_markdown(full_name)}\n"
-        f"🎭 *Роль:* {escape_markdown(role_name)}\n"
-        f"🆔 *ID:* `{user_id}`\n\n"
-        "Выберите раздел для управления:"
+
+    welcome_text = _WELCOME_TMPL.substitute(
+        name=escape_markdown(full_name),
+        role=_ROLE_NAMES_ESC.get(user_role, "Unknown"),
+        uid=user_id
     )
     
-    # Build menu
-    menu = build_admin_menu(user_role)
-    
     await safe_edit_message(
         callback,
         welcome_text,
-        reply_markup=menu.as_markup(),
+        reply_markup=_build_admin_menu_markup(user_role),
         parse_mode=ParseMode.MARKDOWN_V2
     )
     
@@ -3,6 +3,7 @@ from enum import IntEnum
 from typing import Optional, Callable, Any
 from functools import wraps
 
+from aiogram.enums import ParseMode
 from aiogram.types import Message, CallbackQuery
 from dotenv import load_dotenv
 
@@ -27,6 +28,29 @@ class AdminConfig:
         self.co_admin_ids = self._parse_ids(os.getenv("CO_ADMIN_IDS", ""))
         self.rnd_admin_ids = self._parse_ids(os.getenv("RND_ADMIN_IDS", ""))
         self.log_group_id = self._parse_log_group_id(os.getenv("LOG_GROUP_ID", ""))
+        self.role_by_id = self._build_role_map()
+    
+    def _build_role_map(self) -> dict[int, "AdminRole"]:
+        """Flatten the three id sets into a single id -> highest-role map."""
+        # Populate lowest role first so higher roles win on overlapping ids
+        role_by_id: dict[int, AdminRole] = {}
+        for uid in self.rnd_admin_ids:
+            role_by_id[uid] = AdminRole.RND
+        for uid in self.co_admin_ids:
+            role_by_id[uid] = AdminRole.CO
+        for uid in self.admin_ids:
+            role_by_id[uid] = AdminRole.ADMIN
+        return role_by_id
+    
+    def reload(self) -> None:
+        """Re-read role assignments from the environment and swap them in."""
+        self.admin_ids = self._parse_ids(os.getenv("ADMIN_IDS", ""))
+        self.co_admin_ids = self._parse_ids(os.getenv("CO_ADMIN_IDS", ""))
+        self.rnd_admin_ids = self._parse_ids(os.getenv("RND_ADMIN_IDS", ""))
+        self.log_group_id = self._parse_log_group_id(os.getenv("LOG_GROUP_ID", ""))
+        # Build into a local dict and swap, so readers never observe a
+        # half-populated map
+        self.role_by_id = self._build_role_map()
     
     @staticmethod
     def _parse_ids(ids_str: str) -> set[int]:
@@ -61,13 +85,25 @@ def get_user_role(user_id: int) -> AdminRole:
     Returns:
         AdminRole enum value
     """
-    if user_id in admin_config.admin_ids:
-        return AdminRole.ADMIN
-    if user_id in admin_config.co_admin_ids:
-        return AdminRole.CO
-    if user_id in admin_config.rnd_admin_ids:
-        return AdminRole.RND
-    return AdminRole.NONE
+    return admin_config.role_by_id.get(user_id, AdminRole.NONE)
+
+
+_ROLE_NAMES = {
+    AdminRole.ADMIN: "администратор",
+    AdminRole.CO: "со-администратор",
+    AdminRole.RND: "R&D администратор"
+}
+
+# Access-denied message per required role, formatted once at import instead
+# of on every rejected call
+_ACCESS_DENIED_BY_ROLE = {
+    role: (
+        "⛔ *Доступ запрещён*\n\n"
+        f"Для выполнения этого действия требуется роль: _{name}_\\.\n\n"
+        "Обратитесь к администратору, если считаете это ошибкой\\."
+    )
+    for role, name in _ROLE_NAMES.items()
+}
 
 
 def require_role(minimum_role: AdminRole):
@@ -86,6 +122,12 @@ def require_role(minimum_role: AdminRole):
     def decorator(handler: Callable) -> Callable:
         @wraps(handler)
         async def wrapper(event: Message | CallbackQuery, *args, **kwargs) -> Any:
+            # Fast path: a full admin passes every gate, so skip the type
+            # dispatch and denial machinery on the dominant case
+            from_user = getattr(event, "from_user", None)
+            if from_user is not None and admin_config.role_by_id.get(from_user.id) == AdminRole.ADMIN:
+                return await handler(event, *args, **kwargs)
+
             # Extract user_id from either Message or CallbackQuery
             if isinstance(event, Message):
                 user_id = event.from_user.id
@@ -101,30 +143,19 @@ def require_role(minimum_role: AdminRole):
             
             # Check if user has sufficient role
             if user_role < minimum_role:
-                role_names = {
-                    AdminRole.ADMIN: "администратор",
-                    AdminRole.CO: "со-администратор",
-                    AdminRole.RND: "R&D администратор"
-                }
-                required_role_name = role_names.get(minimum_role, "администратор")
-                
-                error_message = (
-                    "⛔ *Доступ запрещён*\n\n"
-                    f"Для выполнения этого действия требуется роль: _{required_role_name}_\\.\n\n"
-                    "Обратитесь к администратору, если считаете это ошибкой\\."
+                error_message = _ACCESS_DENIED_BY_ROLE.get(
+                    minimum_role, _ACCESS_DENIED_BY_ROLE[AdminRole.ADMIN]
                 )
                 
                 if isinstance(event, CallbackQuery):
                     await event.answer("⛔ Доступ запрещён", show_alert=True)
                     if event.message:
                         try:
-                            from aiogram.enums import ParseMode
                             await event.message.answer(error_message, parse_mode=ParseMode.MARKDOWN_V2)
                         except:
                             pass
                 else:
                     try:
-                        from aiogram.enums import ParseMode
                         await send_method(error_message, parse_mode=ParseMode.MARKDOWN_V2)
                     except:
                         await send_method("⛔ Доступ запрещён. Требуется роль администратора.")
@@ -3,15 +3,17 @@ import asyncio
 import logging
 import os
 import re
+import time
 from typing import Callable, Dict, Any, Awaitable
 from dotenv import load_dotenv
 
 from aiogram import Bot, Dispatcher, F, Router
-from aiogram.filters import CommandStart, StateFilter
+from aiogram.filters import Command, CommandObject, CommandStart, StateFilter
 from aiogram.fsm.context import FSMContext
 from aiogram.fsm.state import State, StatesGroup
 from aiogram.types import Message, TelegramObject, ReplyKeyboardMarkup, KeyboardButton
 from aiogram.enums import ParseMode
+from aiogram.exceptions import TelegramRetryAfter
 from aiogram.dispatcher.middlewares.base import BaseMiddleware
 
 from scraper_vin import ClientCardScraper
@@ -19,7 +21,15 @@ from scraper_vin import ClientCardScraper
 # --- Конфигурация ---
 load_dotenv()
 BOT_TOKEN = os.getenv("BOT_TOKEN")
-ALLOWED_USER_IDS = {int(user_id) for user_id in os.getenv("ALLOWED_USER_IDS", "").split(',')}
+# frozenset: состав не меняется после старта, а проверка членства на каждом
+# сообщении остаётся одним хэш-поиском. Пустые и мусорные элементы
+# отбрасываются, чтобы незаполненный .env не ронял бота на int('')
+ALLOWED_USER_IDS = frozenset(
+    int(user_id) for user_id in os.getenv("ALLOWED_USER_IDS", "").split(',')
+    if user_id.strip().isdigit()
+)
+
+logger = logging.getLogger(__name__)
 
 # --- FSM для ожидания ввода ---
 class SearchState(StatesGroup):
@@ -38,9 +48,12 @@ class AccessMiddleware(BaseMiddleware):
         data: Dict[str, Any]
     ) -> Any:
         if event.from_user.id not in ALLOWED_USER_IDS:
-            username = event.from_user.username or "без username"
-            full_name = f"{event.from_user.first_name or ''} {event.from_user.last_name or ''}".strip()
-            print(f"🚫 Отклонен доступ | ID: {event.from_user.id} | @{username} | {full_name}")
+            # print() пишет в stdout синхронно на каждое чужое сообщение;
+            # логируем через logging и собираем строку только если уровень включён
+            if logger.isEnabledFor(logging.DEBUG):
+                username = event.from_user.username or "без username"
+                full_name = f"{event.from_user.first_name or ''} {event.from_user.last_name or ''}".strip()
+                logger.debug("🚫 Отклонен доступ | ID: %s | @%s | %s", event.from_user.id, username, full_name)
             
             # Отправляем сообщение пользователю
             await event.answer(
@@ -53,21 +66,25 @@ class AccessMiddleware(BaseMiddleware):
         return await handler(event, data)
 
 # --- Вспомогательные функции ---
+# Таблица экранирования строится один раз; str.translate проходит строку в C,
+# без регулярного выражения на каждый вызов
+_MD_ESCAPE = str.maketrans({c: '\\' + c for c in r'_*[]()~`>#+-=|{}.!'})
+
 def escape_markdown(text: str) -> str:
     if not isinstance(text, str): text = str(text)
-    escape_chars = r'_*[]()~`>#+-=|{}.!'
-    return re.sub(f'([{re.escape(escape_chars)}])', r'\\\1', text)
+    return text.translate(_MD_ESCAPE)
+
+_NON_DIGIT = re.compile(r'\D')
+_HAS_DIGIT = re.compile(r'\d')
 
 def format_phone_number(phone: str) -> str:
     """Форматирует номер телефона и сразу его экранирует."""
     if not phone: return "N/A"
-    cleaned_phone = re.sub(r'\D', '', phone)
-    if cleaned_phone.startswith('992'):
-        formatted = '+' + cleaned_phone
-    else:
-        formatted = '+992' + cleaned_phone
-    # ✅ ИСПРАВЛЕНИЕ ЗДЕСЬ: Экранируем результат
-    return escape_markdown(formatted)
+    cleaned_phone = _NON_DIGIT.sub('', phone)
+    if not cleaned_phone.startswith('992'):
+        cleaned_phone = '992' + cleaned_phone
+    # Результат состоит из '+' и цифр: экранировать нужно только '+'
+    return '\\+' + cleaned_phone
 
 def format_client_card(data: dict) -> str:
     """Форматирует данные карты клиента в красивое сообщение."""
@@ -76,38 +93,125 @@ def format_client_card(data: dict) -> str:
     docs_info = data.get('docs', {})
     photos = data.get('photos', [])
 
-    text = "✅ *Результаты поиска*\n\n"
-    
+    # Собираем фрагменты в список и склеиваем один раз: += на строках
+    # копирует весь накопленный текст на каждой итерации
+    parts = ["✅ *Результаты поиска*\n\n"]
+
     if car_info:
-        text += "🚗 *АВТОМОБИЛЬ*\n"
+        parts.append("🚗 *АВТОМОБИЛЬ*\n")
         for key, value in car_info.items():
-            text += f"• _{escape_markdown(key)}:_ `{escape_markdown(value or 'N/A')}`\n"
-        text += "\n"
+            parts.append(f"• _{escape_markdown(key)}:_ `{escape_markdown(value or 'N/A')}`\n")
+        parts.append("\n")
 
     if driver_info:
-        text += "👤 *ВОДИТЕЛЬ*\n"
+        parts.append("👤 *ВОДИТЕЛЬ*\n")
         for key, value in driver_info.items():
             if key.lower() == 'телефон':
-                # Функция уже возвращает экранированный номер
-                formatted_phone = format_phone_number(value)
-                # Выводим без ```, так как он уже экранирован
-                text += f"• _{escape_markdown(key)}:_ {formatted_phone}\n"
+                # Функция уже возвращает экранированный номер,
+                # поэтому выводим без ``
+                parts.append(f"• _{escape_markdown(key)}:_ {format_phone_number(value)}\n")
             else:
-                text += f"• _{escape_markdown(key)}:_ `{escape_markdown(value or 'N/A')}`\n"
-        text += "\n"
+                parts.append(f"• _{escape_markdown(key)}:_ `{escape_markdown(value or 'N/A')}`\n")
+        parts.append("\n")
 
     if docs_info:
-        text += "📋 *ДОКУМЕНТЫ*\n"
+        parts.append("📋 *ДОКУМЕНТЫ*\n")
         for key, value in docs_info.items():
-            text += f"• _{escape_markdown(key)}:_ `{escape_markdown(value or 'N/A')}`\n"
-    
+            parts.append(f"• _{escape_markdown(key)}:_ `{escape_markdown(value or 'N/A')}`\n")
+
     if photos:
-        text += "\n🖼️ *ФОТОГРАФИИ*\n"
+        parts.append("\n🖼️ *ФОТОГРАФИИ*\n")
         for i, link in enumerate(photos):
             # Ссылки в Markdown не нужно экранировать
-            text += f"[📷 Фото {i+1}]({link})\n"
+            parts.append(f"[📷 Фото {i+1}]({link})\n")
+
+    return "".join(parts)
+
+# --- Ограничение исходящих сообщений ---
+class _TokenBucket:
+    """
+    Token bucket для исходящих вызовов Telegram: пополняется непрерывно по
+    time.monotonic(), так что всплеск запросов уходит ровным потоком чуть
+    ниже глобального лимита 30 msg/s вместо серии 429.
+    """
+    __slots__ = ("rate", "capacity", "_tokens", "_updated", "_lock")
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= 1.0:
+                self._tokens -= 1.0
+                return
+            wait = (1.0 - self._tokens) / self.rate
+            self._tokens = 0.0
+            self._updated = now + wait
+            await asyncio.sleep(wait)
+
+
+_tg_bucket = _TokenBucket(rate=25.0, capacity=25.0)
+
+
+async def _answer_throttled(message: Message, text: str, **kwargs):
+    """message.answer под глобальным token bucket; на RetryAfter ждём и повторяем."""
+    await _tg_bucket.acquire()
+    try:
+        return await message.answer(text, **kwargs)
+    except TelegramRetryAfter as e:
+        await asyncio.sleep(e.retry_after)
+        return await message.answer(text, **kwargs)
 
-    return text
+
+async def _edit_throttled(message: Message, text: str, **kwargs):
+    """message.edit_text под тем же token bucket, с тем же повтором на RetryAfter."""
+    await _tg_bucket.acquire()
+    try:
+        return await message.edit_text(text, **kwargs)
+    except TelegramRetryAfter as e:
+        await asyncio.sleep(e.retry_after)
+        return await message.edit_text(text, **kwargs)
+
+
+# --- Кэш результатов поиска ---
+# Карта клиента по одному номеру/VIN меняется редко: результат держим 15 минут,
+# а параллельные запросы одного и того же ключа склеиваем в один поход на сайт
+_SEARCH_CACHE_TTL = 900.0
+_SEARCH_CACHE_MAXSIZE = 256
+_search_cache = {}    # ключ -> (дедлайн, результат)
+_search_inflight = {} # ключ -> asyncio.Task
+
+async def _fetch_card_info(key: str) -> dict:
+    result = await scraper.get_client_card_info(key)
+    # Ошибки не кэшируем, чтобы не залипать на сетевых сбоях
+    if not result.get("error"):
+        if len(_search_cache) >= _SEARCH_CACHE_MAXSIZE:
+            _search_cache.pop(min(_search_cache, key=lambda k: _search_cache[k][0]))
+        _search_cache[key] = (time.monotonic() + _SEARCH_CACHE_TTL, result)
+    return result
+
+async def get_card_info_cached(search_query: str, skip_cache: bool = False) -> dict:
+    """Кэширующая обёртка над scraper.get_client_card_info."""
+    key = search_query.upper()
+    if skip_cache:
+        # /force: сбрасываем запись и идём на сайт заново
+        _search_cache.pop(key, None)
+    cached = _search_cache.get(key)
+    if cached is not None and cached[0] > time.monotonic():
+        return cached[1]
+    task = _search_inflight.get(key)
+    if task is None:
+        task = asyncio.create_task(_fetch_card_info(key))
+        task.add_done_callback(lambda _t, k=key: _search_inflight.pop(k, None))
+        _search_inflight[key] = task
+    return await task
 
 # --- Клавиатура ---
 main_kb = ReplyKeyboardMarkup(
@@ -116,64 +220,93 @@ main_kb = ReplyKeyboardMarkup(
     input_field_placeholder="Введите номер или VIN"
 )
 
+# --- Статические тексты ---
+# MarkdownV2-строки неизменны, собираем их один раз при старте
+_WELCOME_MD2 = (
+    "👋 *Добро пожаловать в БДА Поиск\\!*\n\n"
+    "🔍 Я помогу вам найти информацию об автомобиле "
+    "по номеру или VIN\\-коду\\.\n\n"
+    "Нажмите кнопку *\"🚗 Проверить авто\"* или сразу введите "
+    "номер автомобиля или VIN\\-код\\."
+)
+
+_SEARCH_PROMPT_MD2 = (
+    "📋 *Введите данные для поиска:*\n\n"
+    "• Номер автомобиля \\(например: 0000AA01\\)\n"
+    "• VIN\\-код автомобиля\n\n"
+    "_Просто отправьте текстом\\._"
+)
+
+_WAIT_MD2 = (
+    "🔍 *Идёт поиск\\.\\.\\.*\n\n"
+    "_Пожалуйста, подождите\\.\\.\\._"
+)
+
+_NOT_UNDERSTOOD_MD2 = (
+    "❓ *Не понял запрос*\n\n"
+    "Пожалуйста, нажмите кнопку *\"🚗 Проверить авто\"* "
+    "или отправьте номер автомобиля\\."
+)
+
+_FORCE_USAGE_MD2 = (
+    "📋 Использование: `/force НОМЕР`\n"
+    "Запрос уйдёт на сайт в обход кэша\\."
+)
+
+_ERROR_PREFIX_MD2 = "❌ *Ошибка поиска*\n\n_"
+_ERROR_SUFFIX_MD2 = "_\n\nПопробуйте ещё раз или проверьте корректность введённых данных\\."
+
+# Общие аргументы ответов: основная клавиатура + MarkdownV2
+_MD2_KW = {"parse_mode": ParseMode.MARKDOWN_V2, "reply_markup": main_kb}
+
+async def _run_search(message: Message, search_query: str, skip_cache: bool = False) -> None:
+    """Общий сценарий поиска: плейсхолдер -> скрейп -> результат тем же сообщением."""
+    wait_message = await _answer_throttled(message, _WAIT_MD2, **_MD2_KW)
+
+    search_result = await get_card_info_cached(search_query, skip_cache=skip_cache)
+
+    # Редактируем сообщение "Идёт поиск..." вместо удаления и повторной
+    # отправки — один вызов Bot API вместо двух
+    if search_result.get("error"):
+        await _edit_throttled(
+            wait_message,
+            f"{_ERROR_PREFIX_MD2}{escape_markdown(search_result['error'])}{_ERROR_SUFFIX_MD2}",
+            parse_mode=ParseMode.MARKDOWN_V2
+        )
+        return
+
+    await _edit_throttled(wait_message, format_client_card(search_result), parse_mode=ParseMode.MARKDOWN_V2)
+
+
 # --- Обработчики ---
 @router.message(CommandStart())
 async def cmd_start(message: Message, state: FSMContext):
     await state.clear()
     
-    welcome_text = (
-        "👋 *Добро пожаловать в БДА Поиск\\!*\n\n"
-        "🔍 Я помогу вам найти информацию об автомобиле "
-        "по номеру или VIN\\-коду\\.\n\n"
-        "Нажмите кнопку *\"🚗 Проверить авто\"* или сразу введите "
-        "номер автомобиля или VIN\\-код\\."
-    )
-    
-    await message.answer(
-        welcome_text,
-        reply_markup=main_kb,
-        parse_mode=ParseMode.MARKDOWN_V2
-    )
+    await _answer_throttled(message, _WELCOME_MD2, **_MD2_KW)
 
 @router.message(F.text == "🚗 Проверить авто")
 async def start_search(message: Message, state: FSMContext):
-    await message.answer(
-        "📋 *Введите данные для поиска:*\n\n"
-        "• Номер автомобиля \\(например: 0000AA01\\)\n"
-        "• VIN\\-код автомобиля\n\n"
-        "_Просто отправьте текстом\\._",
-        parse_mode=ParseMode.MARKDOWN_V2
-    )
+    await _answer_throttled(message, _SEARCH_PROMPT_MD2, parse_mode=ParseMode.MARKDOWN_V2)
     await state.set_state(SearchState.waiting_for_input)
 
 
+@router.message(Command("force"))
+async def cmd_force(message: Message, command: CommandObject):
+    """Принудительный поиск в обход кэша: /force <номер или VIN>"""
+    search_query = (command.args or "").strip()
+    if not search_query:
+        await _answer_throttled(message, _FORCE_USAGE_MD2, parse_mode=ParseMode.MARKDOWN_V2)
+        return
+
+    await _run_search(message, search_query, skip_cache=True)
+
 @router.message(StateFilter(SearchState.waiting_for_input))
 async def handle_vin_or_plate(message: Message, state: FSMContext):
     search_query = message.text.strip()
     await state.clear()
     
-    wait_message = await message.answer(
-        "🔍 *Идёт поиск\\.\\.\\.*\n\n"
-        "_Пожалуйста, подождите\\.\\.\\._",
-        reply_markup=main_kb,
-        parse_mode=ParseMode.MARKDOWN_V2
-    )
-    
-    search_result = await asyncio.to_thread(scraper.get_client_card_info, search_query)
-    
-    await wait_message.delete()
-
-    if search_result.get("error"):
-        await message.answer(
-            f"❌ *Ошибка поиска*\n\n"
-            f"_{escape_markdown(search_result['error'])}_\n\n"
-            "Попробуйте ещё раз или проверьте корректность введённых данных\\.",
-            parse_mode=ParseMode.MARKDOWN_V2
-        )
-        return
-        
-    formatted_text = format_client_card(search_result)
-    await message.answer(formatted_text, parse_mode=ParseMode.MARKDOWN_V2)
+    await _run_search(message, search_query)
 
 @router.message(F.text)
 async def handle_direct_input(message: Message, state: FSMContext):
@@ -181,36 +314,10 @@ async def handle_direct_input(message: Message, state: FSMContext):
     search_query = message.text.strip()
     
     # Простая проверка: если текст содержит буквы и цифры, считаем это потенциальным номером/VIN
-    if len(search_query) >= 4 and any(c.isdigit() for c in search_query):
-        wait_message = await message.answer(
-            "🔍 *Идёт поиск\\.\\.\\.*\n\n"
-            "_Пожалуйста, подождите\\.\\.\\._",
-            reply_markup=main_kb,
-            parse_mode=ParseMode.MARKDOWN_V2
-        )
-        
-        search_result = await asyncio.to_thread(scraper.get_client_card_info, search_query)
-        
-        await wait_message.delete()
-
-        if search_result.get("error"):
-            await message.answer(
-                f"❌ *Ошибка поиска*\n\n"
-                f"_{escape_markdown(search_result['error'])}_\n\n"
-                "Попробуйте ещё раз или проверьте корректность введённых данных\\.",
-                parse_mode=ParseMode.MARKDOWN_V2
-            )
-            return
-            
-        formatted_text = format_client_card(search_result)
-        await message.answer(formatted_text, parse_mode=ParseMode.MARKDOWN_V2)
+    if len(search_query) >= 4 and _HAS_DIGIT.search(search_query):
+        await _run_search(message, search_query)
     else:
-        await message.answer(
-            "❓ *Не понял запрос*\n\n"
-            "Пожалуйста, нажмите кнопку *\"🚗 Проверить авто\"* "
-            "или отправьте номер автомобиля\\.",
-            parse_mode=ParseMode.MARKDOWN_V2
-        )
+        await _answer_throttled(message, _NOT_UNDERSTOOD_MD2, parse_mode=ParseMode.MARKDOWN_V2)
 
 # --- Запуск бота ---
 async def main():
@@ -228,13 +335,23 @@ async def main():
     print("="*50 + "\n")
     
     await bot.delete_webhook(drop_pending_updates=True)
-    await dp.start_polling(bot)
+    try:
+        await dp.start_polling(bot)
+    finally:
+        await scraper.close()
 
 if __name__ == "__main__":
     logging.basicConfig(
         level=logging.INFO,
         format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
     )
+    # uvloop заметно ускоряет сокетные операции event loop; без него бот
+    # работает на стандартном цикле
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
     try:
         asyncio.run(main())
     except KeyboardInterrupt:
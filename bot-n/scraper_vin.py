@@ -1,6 +1,32 @@
 # scraper_vin.py
-import requests
-from bs4 import BeautifulSoup
+import asyncio
+import os
+import time
+
+import aiohttp
+from bs4 import BeautifulSoup, SoupStrainer
+
+# lxml парсит HTML в разы быстрее встроенного html.parser; если он не
+# установлен, прозрачно откатываемся
+try:
+    import lxml  # noqa: F401
+    _BS_PARSER = "lxml"
+except ImportError:
+    _BS_PARSER = "html.parser"
+
+# Для карты клиента нужны только заголовки секций, таблицы, абзацы с фото и
+# <title> (проверка страницы авторизации) — остальное дерево не строим
+_CARD_STRAINER = SoupStrainer(["h5", "table", "p", "title"])
+
+# Страница карты клиента — десятки килобайт; всё, что заметно больше, — это
+# не наша страница, и целиком её в память не читаем
+_MAX_BODY_BYTES = 512 * 1024
+
+# Сессия на сайте живёт заметно дольше одного запроса: помним, что она
+# аутентифицирована, ~25 минут и сохраняем куки на диск, чтобы рестарт бота
+# не начинался с повторного логина
+_AUTH_TTL = 1500.0
+_COOKIES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cookies_vin")
 
 class ClientCardScraper:
     def __init__(self, login, password):
@@ -8,97 +34,180 @@ class ClientCardScraper:
         self.search_url = "https://rbda.dc.tj/pages/clientcard.php"
         self.login = login
         self.password = password
-        self.session = requests.Session()
-        self.session.headers.update({
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
-            "Origin": "https://rbda.dc.tj",
-        })
+        # Сессия создаётся лениво внутри event loop (как в основном scraper.py)
+        self._session = None
+        self._auth_expires_at = 0.0
+        # Одновременные поиски с протухшей сессией должны порождать один
+        # логин, а не гонку логинов, затирающих куки друг друга
+        self._auth_lock = asyncio.Lock()
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Ленивая инициализация aiohttp-сессии с общими заголовками."""
+        if self._session is None or self._session.closed:
+            jar = aiohttp.CookieJar()
+            if os.path.exists(_COOKIES_PATH):
+                try:
+                    jar.load(_COOKIES_PATH)
+                    # Доверяем сохранённым кукам до первого опровержения:
+                    # если они протухли, сработает обычный fallback на логин
+                    self._auth_expires_at = time.monotonic() + _AUTH_TTL
+                except Exception:
+                    pass
+            self._session = aiohttp.ClientSession(
+                cookie_jar=jar,
+                # Кэш DNS и длинный keepalive: ходим на один и тот же хост,
+                # поэтому не резолвим его и не открываем TLS заново на каждый
+                # запрос
+                connector=aiohttp.TCPConnector(
+                    limit_per_host=10,
+                    use_dns_cache=True,
+                    ttl_dns_cache=600,
+                    keepalive_timeout=60,
+                    enable_cleanup_closed=True,
+                ),
+                timeout=aiohttp.ClientTimeout(total=15, connect=5),
+                headers={
+                    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
+                    "Origin": "https://rbda.dc.tj",
+                }
+            )
+        return self._session
 
-    def _login(self) -> bool:
+    def _save_cookies(self):
+        """Сохраняет куки сессии на диск (лучший вариант, но не критичный)."""
+        if self._session is not None:
+            try:
+                self._session.cookie_jar.save(_COOKIES_PATH)
+            except Exception:
+                pass
+
+    async def close(self):
+        """Закрывает aiohttp-сессию (вызывается при остановке бота)."""
+        if self._session is not None and not self._session.closed:
+            self._save_cookies()
+            await self._session.close()
+
+    async def _login(self) -> bool:
         """✅ ИСПРАВЛЕННАЯ, НАДЕЖНАЯ АВТОРИЗАЦИЯ."""
-        self.session.cookies.clear()
+        session = await self._get_session()
+        session.cookie_jar.clear()
         # Сначала делаем GET-запрос на главную, чтобы получить первичные куки
         try:
-            self.session.get("https://rbda.dc.tj/index.php", timeout=10)
-        except requests.exceptions.RequestException:
+            async with session.get("https://rbda.dc.tj/index.php") as response:
+                await response.read()
+        except aiohttp.ClientError:
             pass # Не страшно, если не получится
 
         payload = {'login': self.login, 'password': self.password}
         print(f"🚀 Выполняю авторизацию...")
         try:
             # Отправляем POST-запрос на URL авторизации
-            response = self.session.post(self.auth_url, data=payload, allow_redirects=False, timeout=15) # allow_redirects=False
-            response.raise_for_status()
-            
-            # Успешный логин должен вернуть редирект (статус 302) на dashboard.php
-            if response.status_code == 302 and 'dashboard.php' in response.headers.get('Location', ''):
-                 print("✅ Авторизация прошла успешно! Получен редирект.")
-                 return True
-            
-            print(f"❌ Ошибка авторизации: получен статус {response.status_code}, ожидался 302.")
-            return False
-        except requests.exceptions.RequestException as e:
+            async with session.post(self.auth_url, data=payload, allow_redirects=False) as response: # allow_redirects=False
+                response.raise_for_status()
+
+                # Успешный логин должен вернуть редирект (статус 302) на dashboard.php
+                if response.status == 302 and 'dashboard.php' in response.headers.get('Location', ''):
+                    print("✅ Авторизация прошла успешно! Получен редирект.")
+                    self._auth_expires_at = time.monotonic() + _AUTH_TTL
+                    self._save_cookies()
+                    return True
+
+                print(f"❌ Ошибка авторизации: получен статус {response.status}, ожидался 302.")
+                return False
+        except aiohttp.ClientError as e:
             print(f"❌ Ошибка сети при авторизации: {e}")
             return False
-            
-    def get_client_card_info(self, vin_or_plate: str):
+
+    async def _fetch_card_page(self, payload: dict) -> bytes:
+        """Запрашивает страницу карты клиента и возвращает её HTML (в байтах)."""
+        session = await self._get_session()
+        async with session.post(self.search_url, data=payload) as response:
+            response.raise_for_status()
+            # Читаем не больше лимита: BeautifulSoup принимает байты напрямую,
+            # а аномально большой ответ прерываем, не раздувая память
+            body = await response.content.read(_MAX_BODY_BYTES + 1)
+            if len(body) > _MAX_BODY_BYTES:
+                raise aiohttp.ClientPayloadError(
+                    f"Ответ сервера превышает {_MAX_BODY_BYTES} байт"
+                )
+            return body
+
+    async def get_client_card_info(self, vin_or_plate: str):
         # Сначала пытаемся сделать запрос. Если сессия "живая", он пройдет.
         print(f"🚀 Ищу карту клиента для {vin_or_plate}...")
         try:
+            # Если сессия заведомо протухла, логинимся заранее и не тратим
+            # поисковый запрос на получение страницы авторизации
+            if time.monotonic() >= self._auth_expires_at:
+                async with self._auth_lock:
+                    # Перепроверяем под замком: пока мы ждали, параллельный
+                    # поиск мог уже авторизоваться
+                    if time.monotonic() >= self._auth_expires_at:
+                        if not await self._login():
+                            return {"error": "Не удалось выполнить авторизацию. Проверьте учетные данные."}
+
             payload = {'plate': vin_or_plate.upper(), 'srchfines': ''}
-            response = self.session.post(self.search_url, data=payload, timeout=15)
-            response.raise_for_status()
+            soup = BeautifulSoup(await self._fetch_card_page(payload), _BS_PARSER, parse_only=_CARD_STRAINER)
 
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
             # Если мы на странице входа - логинимся
             if "Авторизация" in soup.title.string:
                 print("⚠️ Сессия недействительна или истекла. Выполняю вход...")
-                if not self._login():
-                    return {"error": "Не удалось выполнить авторизацию. Проверьте учетные данные."}
-                
+                # Сервер опроверг нашу оценку свежести сессии (например,
+                # куки с диска оказались мёртвыми) — помечаем её протухшей
+                self._auth_expires_at = 0.0
+                async with self._auth_lock:
+                    # Сессию мог только что обновить другой поиск — тогда
+                    # достаточно просто повторить запрос
+                    if time.monotonic() >= self._auth_expires_at:
+                        if not await self._login():
+                            return {"error": "Не удалось выполнить авторизацию. Проверьте учетные данные."}
+
                 # Повторяем запрос после успешного входа
                 print(f"🚀 Повторный запрос карты клиента для {vin_or_plate}...")
-                response = self.session.post(self.search_url, data=payload, timeout=15)
-                response.raise_for_status()
-                soup = BeautifulSoup(response.text, 'html.parser')
+                soup = BeautifulSoup(await self._fetch_card_page(payload), _BS_PARSER, parse_only=_CARD_STRAINER)
 
             print("✅ Страница с картой клиента получена! Начинаю парсинг...")
-            
+
             results = {}
             data_map = {'Автомобиль': 'car', 'Водитель': 'driver', 'Документы': 'docs'}
-            
-            all_headers = soup.find_all("h5", class_="card-title")
-            
-            for header in all_headers:
-                header_text = header.text.strip()
-                result_key = data_map.get(header_text)
-                if result_key:
-                    results[result_key] = {}
-                    table = header.find_next("table", class_="table")
-                    if not table: continue
-                    for row in table.find("tbody").find_all("tr"):
-                        cells = row.find_all("td")
-                        if len(cells) >= 2:
-                            label = cells[0].text.strip()
-                            value = " ".join(c.text.strip() for c in cells[1:])
-                            if label:
-                                results[result_key][label] = value
-            
-            photos_header = soup.find("h5", class_="card-title", text=lambda t: t and "Фото" in t)
-            if photos_header:
-                photo_links = []
-                photo_container = photos_header.find_next("p")
-                if photo_container:
-                    for img_tag in photo_container.find_all("img"):
-                        if img_tag.has_attr('src') and img_tag['src']:
-                            photo_links.append(img_tag['src'])
-                if photo_links:
-                    results['photos'] = photo_links
+
+            # Один проход в порядке документа: заголовок запоминается, и
+            # первая таблица/абзац после него относится к этой секции —
+            # вместо повторного обхода дерева через find_next на каждый
+            # заголовок
+            pending_key = None
+            pending_photos = False
+            for node in soup.find_all(["h5", "table", "p"]):
+                classes = node.get("class") or ()
+                if node.name == "h5" and "card-title" in classes:
+                    header_text = node.text.strip()
+                    pending_key = data_map.get(header_text)
+                    pending_photos = "Фото" in header_text
+                    if pending_key:
+                        results[pending_key] = {}
+                elif node.name == "table" and pending_key and "table" in classes:
+                    tbody = node.find("tbody")
+                    if tbody:
+                        for row in tbody.find_all("tr"):
+                            cells = row.find_all("td")
+                            if len(cells) >= 2:
+                                label = cells[0].text.strip()
+                                value = " ".join(c.text.strip() for c in cells[1:])
+                                if label:
+                                    results[pending_key][label] = value
+                    pending_key = None
+                elif node.name == "p" and pending_photos:
+                    photo_links = [
+                        img_tag['src'] for img_tag in node.find_all("img")
+                        if img_tag.has_attr('src') and img_tag['src']
+                    ]
+                    if photo_links:
+                        results['photos'] = photo_links
+                    pending_photos = False
 
             if not results:
                 return {"error": "Информация по данному номеру/VIN не найдена на странице."}
 
             return results
-        except requests.exceptions.RequestException as e:
+        except aiohttp.ClientError as e:
             return {"error": f"Ошибка сети: {e}"}
@@ -1,5 +1,6 @@
 # bot.py
 import asyncio
+import concurrent.futures
 import logging
 import os
 from dotenv import load_dotenv
@@ -1930,6 +1931,14 @@ async def handle_media_request(callback: CallbackQuery):
 async def main():
     global fine_monitor, mode_service
     
+    # The fines scraper still runs through asyncio.to_thread; the stock
+    # executor is sized min(32, cpu+4), which on small hosts caps how many
+    # slow scrapes can overlap. Size it for I/O-bound work explicitly.
+    loop = asyncio.get_running_loop()
+    loop.set_default_executor(
+        concurrent.futures.ThreadPoolExecutor(max_workers=32, thread_name_prefix="scrape")
+    )
+    
     # Initialize database first
     await database.init_db()
     logger.info("Database initialized successfully")
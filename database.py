@@ -7,11 +7,27 @@ from contextlib import asynccontextmanager
 import re
 import json
 
-from sqlalchemy import String, Integer, Boolean, DateTime, Date, Text, JSON, select, func
+from sqlalchemy import String, Integer, Boolean, DateTime, Date, Text, JSON, select, func, event
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 from sqlalchemy.exc import SQLAlchemyError
 
+# orjson serializes the JSON audit payloads several times faster than the
+# stdlib; fall back to json transparently where it is not installed
+try:
+    import orjson
+
+    def _json_serialize(obj: Any) -> str:
+        # SQLAlchemy expects str from json_serializer; orjson emits bytes
+        return orjson.dumps(obj, default=str).decode("utf-8")
+
+    _json_deserialize = orjson.loads
+except ImportError:
+    def _json_serialize(obj: Any) -> str:
+        return json.dumps(obj, default=str)
+
+    _json_deserialize = json.loads
+
 logger = logging.getLogger(__name__)
 
 
@@ -157,13 +173,34 @@ class Database:
             database_url,
             echo=False,
             pool_pre_ping=True,
-            pool_recycle=3600
+            pool_recycle=3600,
+            # The admin panel gathers up to three queries per card render and
+            # the default pool (5 + 10 overflow) makes them queue for a
+            # checkout under concurrent admins; size the pool so parallel
+            # reads actually overlap
+            pool_size=10,
+            max_overflow=40,
+            json_serializer=_json_serialize,
+            json_deserializer=_json_deserialize
         )
         self.async_session_maker = async_sessionmaker(
             self.engine,
             class_=AsyncSession,
             expire_on_commit=False
         )
+        
+        if database_url.startswith("sqlite"):
+            # WAL lets readers proceed while a write commits, and NORMAL
+            # syncing drops the per-commit fsync from two to (amortized)
+            # zero — safe for a single-process bot, and the main cost in
+            # write-heavy paths like the admin audit log
+            @event.listens_for(self.engine.sync_engine, "connect")
+            def _set_sqlite_pragmas(dbapi_conn, connection_record):
+                cursor = dbapi_conn.cursor()
+                cursor.execute("PRAGMA journal_mode=WAL")
+                cursor.execute("PRAGMA synchronous=NORMAL")
+                cursor.close()
+        
         logger.info(f"Database initialized with URL: {database_url}")
         
         # Statistics cache
@@ -278,6 +315,28 @@ class Database:
             
             return [user.to_dict() for user in users], total_count
     
+    async def search_users_fast(
+        self,
+        limit: int = 10,
+        offset: int = 0
+    ) -> tuple[List[Dict[str, Any]], bool]:
+        """
+        Fetch one page of users without the COUNT(*) aggregate.
+        Requests limit+1 rows to detect whether a next page exists.
+        Returns (users_list, has_more).
+        """
+        async with self.get_session() as session:
+            query = (
+                select(User)
+                .order_by(User.created_at.desc())
+                .limit(limit + 1)
+                .offset(offset)
+            )
+            result = await session.execute(query)
+            users = result.scalars().all()
+            has_more = len(users) > limit
+            return [user.to_dict() for user in users[:limit]], has_more
+
     async def update_user_premium(
         self,
         user_id: int,
@@ -438,6 +497,66 @@ class Database:
                 await session.delete(binding)
                 logger.info(f"Removed vehicle binding for user {user_id}")
     
+    async def remove_vehicle_binding_returning_plate(self, user_id: int) -> Optional[str]:
+        """
+        Remove a user's vehicle binding and return the removed plate number.
+        
+        Read and delete share one session/transaction, so callers that need
+        the old plate for audit logging pay a single commit instead of two
+        round-trips through separate sessions.
+        """
+        async with self.get_session() as session:
+            result = await session.execute(
+                select(VehicleBinding).where(VehicleBinding.user_id == user_id)
+            )
+            binding = result.scalar_one_or_none()
+            
+            if not binding:
+                return None
+            
+            plate = binding.plate_number
+            await session.delete(binding)
+            logger.info(f"Removed vehicle binding for user {user_id}")
+            return plate
+    
+    async def replace_vehicle_binding(
+        self,
+        user_id: int,
+        plate_number: str,
+        expires_at: datetime
+    ) -> Optional[str]:
+        """
+        Set or replace a user's vehicle binding and return the previous plate
+        (None if the user had no binding). Single transaction, same semantics
+        as set_vehicle_binding otherwise.
+        """
+        async with self.get_session() as session:
+            result = await session.execute(
+                select(VehicleBinding).where(VehicleBinding.user_id == user_id)
+            )
+            binding = result.scalar_one_or_none()
+            
+            normalized_plate = plate_number.upper()
+            old_plate = None
+            if binding:
+                old_plate = binding.plate_number
+                if binding.plate_number != normalized_plate:
+                    binding.tracked_orders = None
+                binding.plate_number = normalized_plate
+                binding.subscription_expires_at = expires_at
+            else:
+                binding = VehicleBinding(
+                    user_id=user_id,
+                    plate_number=normalized_plate,
+                    subscription_expires_at=expires_at,
+                    tracked_orders=None
+                )
+                session.add(binding)
+            
+            await session.flush()
+            logger.info(f"Set vehicle binding: user_id={user_id}, plate={plate_number}")
+            return old_plate
+    
     async def get_active_premium_bindings(self) -> List[Dict[str, Any]]:
         """Get all active premium bindings (not expired) - for monitor"""
         async with self.get_session() as session:
@@ -909,6 +1028,87 @@ class Database:
             logger.info(f"Created subscription {subscription.id} for user {user_id}")
             return subscription.id
     
+    async def approve_subscription_atomic(
+        self,
+        request_id: int,
+        user_id: int,
+        new_expiry: datetime,
+        payment_amount: Optional[str],
+        admin_user_id: int,
+        action_details: Optional[Dict[str, Any]] = None
+    ):
+        """
+        Apply the whole subscription-approval write set in one transaction:
+        subscription row, user premium flags, payment-request status and the
+        admin audit record. One session and one commit instead of four.
+        """
+        async with self.get_session() as session:
+            session.add(Subscription(
+                user_id=user_id,
+                subscription_type="premium",
+                starts_at=datetime.now(),
+                expires_at=new_expiry,
+                is_active=True,
+                payment_amount=payment_amount,
+                payment_method="manual_approval"
+            ))
+            
+            result = await session.execute(
+                select(User).where(User.user_id == user_id)
+            )
+            user = result.scalar_one_or_none()
+            if user:
+                user.is_premium = True
+                user.premium_expires_at = new_expiry
+                user.updated_at = datetime.now()
+            
+            result = await session.execute(
+                select(PaymentRequest).where(PaymentRequest.id == request_id)
+            )
+            request = result.scalar_one_or_none()
+            if request:
+                request.status = "approved"
+                request.payment_method = "manual_approval"
+                request.updated_at = datetime.now()
+            
+            session.add(AdminActionLog(
+                admin_user_id=admin_user_id,
+                action_type="approve_payment",
+                target_user_id=user_id,
+                action_details=action_details
+            ))
+            
+            logger.info(f"Approved payment request {request_id} for user {user_id}")
+    
+    async def reject_payment_atomic(
+        self,
+        request_id: int,
+        user_id: int,
+        admin_user_id: int,
+        action_details: Optional[Dict[str, Any]] = None
+    ):
+        """
+        Apply the payment-rejection write set (request status + admin audit
+        record) in one transaction.
+        """
+        async with self.get_session() as session:
+            result = await session.execute(
+                select(PaymentRequest).where(PaymentRequest.id == request_id)
+            )
+            request = result.scalar_one_or_none()
+            if request:
+                request.status = "rejected"
+                request.updated_at = datetime.now()
+            
+            session.add(AdminActionLog(
+                admin_user_id=admin_user_id,
+                action_type="reject_payment",
+                target_user_id=user_id,
+                action_details=action_details
+            ))
+            
+            logger.info(f"Rejected payment request {request_id} for user {user_id}")
+    
     async def get_active_subscription(self, user_id: int) -> Optional[Dict[str, Any]]:
         """Get active subscription for a user"""
         async with self.get_session() as session:
@@ -928,6 +1128,9 @@ class Database:
                     "subscription_type": subscription.subscription_type,
                     "starts_at": subscription.starts_at.isoformat(),
                     "expires_at": subscription.expires_at.isoformat(),
+                    # Native datetime as loaded by the ORM, so hot paths can
+                    # compare/extend expiry without re-parsing the ISO string
+                    "expires_at_dt": subscription.expires_at,
                     "is_active": subscription.is_active,
                     "payment_amount": subscription.payment_amount,
                     "payment_method": subscription.payment_method,